@@ -154,6 +154,35 @@ REST_FRAMEWORK = {
     # ]
 }
 
+# Phân trang API danh sách từ (cursor theo -id): số từ mỗi trang mặc định và tối đa (?page_size=)
+WORDS_API_PAGINATION = {
+    'PAGE_SIZE': 100,
+    'MAX_PAGE_SIZE': 1000,
+}
+
+# Cache đáp án dùng khi chấm điểm quiz (theo từng process): số từ tối đa và thời gian sống (giây)
+WORDS_ANSWER_KEY_CACHE = {
+    'MAXSIZE': 10000,
+    'TTL': 300,
+}
+
+# Chấm điểm chấp nhận lỗi gõ (quiz medium, "did you mean"): khoảng cách sửa tối đa
+# và thời gian (giây) trước khi chỉ mục nghĩa được dựng lại từ database
+WORDS_FUZZY_MATCH = {
+    'MAX_DISTANCE': 2,
+    'INDEX_TTL': 3600,
+}
+
+# Thời gian (giây) trước khi chỉ mục tra ngược nghĩa -> từ và chỉ mục autocomplete
+# được dựng lại từ database (để nhận thay đổi từ process khác)
+WORDS_REVERSE_INDEX_TTL = 3600
+
+# Thời gian (giây) trước khi bảng xếp hạng trong bộ nhớ được dựng lại từ database
+USERS_LEADERBOARD_TTL = 300
+
+# Số thread băm mật khẩu chạy cùng lúc khi đăng ký và tạo user hàng loạt
+USERS_PASSWORD_HASH_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+
 # Cấu hình Simple JWT (tùy chọn, ví dụ: thời gian sống của token)
 from datetime import timedelta
 
@@ -0,0 +1,130 @@
+import bisect
+import threading
+import time
+from django.conf import settings
+from .models import HighScore
+
+# Số giây trước khi bảng xếp hạng được dựng lại từ database (để nhận điểm do process khác ghi)
+LEADERBOARD_TTL = getattr(settings, 'USERS_LEADERBOARD_TTL', 300)
+
+
+class ScoreRanking:
+    """
+    Điểm của mọi người chơi ở một cấp độ, giữ trong một list đã sắp xếp
+    để tính hạng và percentile bằng bisect trong O(log n).
+    """
+
+    def __init__(self, entries=()):
+        # entries: (user_id, score)
+        self._by_user = dict(entries)
+        self._scores = sorted(self._by_user.values())
+
+    def __len__(self):
+        return len(self._scores)
+
+    def score_of(self, user_id):
+        return self._by_user.get(user_id)
+
+    def set_score(self, user_id, score):
+        old_score = self._by_user.get(user_id)
+        if old_score == score:
+            return
+        if old_score is not None:
+            self._discard(old_score)
+        self._by_user[user_id] = score
+        bisect.insort(self._scores, score)
+
+    def raise_score(self, user_id, score):
+        """
+        Như set_score() nhưng không bao giờ hạ điểm: hai lần nộp đồng thời có thể tới đây
+        theo thứ tự ngược (90 rồi 80), điểm giữ lại vẫn là max(cũ, mới) như trong database.
+        """
+        old_score = self._by_user.get(user_id)
+        if old_score is None or score > old_score:
+            self.set_score(user_id, score)
+
+    def remove(self, user_id):
+        old_score = self._by_user.pop(user_id, None)
+        if old_score is not None:
+            self._discard(old_score)
+
+    def _discard(self, score):
+        position = bisect.bisect_left(self._scores, score)
+        if position < len(self._scores) and self._scores[position] == score:
+            del self._scores[position]
+
+    def rank(self, score):
+        """
+        Hạng của `score`: 1 + số người chơi có điểm cao hơn (bằng điểm thì cùng hạng).
+        """
+        return len(self._scores) - bisect.bisect_right(self._scores, score) + 1
+
+    def percentile(self, score):
+        """
+        Phần trăm người chơi có điểm thấp hơn hoặc bằng `score`.
+        """
+        if not self._scores:
+            return 0.0
+        return 100.0 * bisect.bisect_right(self._scores, score) / len(self._scores)
+
+
+class Leaderboard:
+    """
+    Một ScoreRanking cho mỗi cấp độ, dựng từ bảng HighScore ở lần dùng đầu tiên và dựng lại
+    khi cũ hơn `ttl` giây. Điểm mới được cập nhật trực tiếp qua score_submitted() (khi người chơi nộp điểm)
+    và score_changed()/score_deleted() (các thay đổi khác).
+    """
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._rankings = {}  # difficulty -> (built_at, ScoreRanking)
+        self._lock = threading.RLock()
+
+    def build(self, difficulty):
+        rows = HighScore.objects.filter(difficulty=difficulty).values_list('user_id', 'score')
+        return ScoreRanking(rows.iterator(chunk_size=10000))
+
+    def get(self, difficulty):
+        with self._lock:
+            built_at, ranking = self._rankings.get(difficulty, (None, None))
+            if ranking is None or (self.ttl is not None and time.monotonic() - built_at >= self.ttl):
+                ranking = self.build(difficulty)
+                self._rankings[difficulty] = (time.monotonic(), ranking)
+            return ranking
+
+    def mark_stale(self):
+        with self._lock:
+            self._rankings.clear()
+
+    def score_changed(self, difficulty, user_id, score):
+        with self._lock:
+            if difficulty in self._rankings:
+                self._rankings[difficulty][1].set_score(user_id, score)
+
+    def score_submitted(self, difficulty, user_id, score):
+        with self._lock:
+            if difficulty in self._rankings:
+                self._rankings[difficulty][1].raise_score(user_id, score)
+
+    def score_deleted(self, difficulty, user_id):
+        with self._lock:
+            if difficulty in self._rankings:
+                self._rankings[difficulty][1].remove(user_id)
+
+    def rank(self, difficulty, score):
+        with self._lock:
+            return self.get(difficulty).rank(score)
+
+    def standing(self, difficulty, user_id):
+        """
+        Trả về (score, rank, total_players, percentile) của user; score, rank và percentile là None nếu user chưa có điểm.
+        """
+        with self._lock:
+            ranking = self.get(difficulty)
+            score = ranking.score_of(user_id)
+            if score is None:
+                return None, None, len(ranking), None
+            return score, ranking.rank(score), len(ranking), ranking.percentile(score)
+
+
+leaderboard = Leaderboard(ttl=LEADERBOARD_TTL)
@@ -0,0 +1,146 @@
+import csv
+import os
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Q
+from users.passwords import hash_passwords
+
+REQUIRED_COLUMNS = ('username',)
+OPTIONAL_COLUMNS = ('email', 'first_name', 'last_name', 'password')
+
+
+class Command(BaseCommand):
+    help = ('Creates user accounts from a CSV roster with the columns username, email, first_name, '
+            'last_name, password (only username is required). Users whose username or email already '
+            'exists are skipped. Rows without a password get an unusable password.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'file',
+            type=str,
+            help='Path of the CSV roster, relative to the project root directory or absolute.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of users looked up, hashed and inserted per batch (default: 500).',
+        )
+
+    def handle(self, *args, **options):
+        file_path = os.path.join(settings.BASE_DIR, options['file'])
+        self.batch_size = options['batch_size']
+        self.verbosity = options['verbosity']
+        if self.batch_size < 1:
+            raise CommandError('--batch-size must be at least 1.')
+
+        self.created_count = 0
+        self.existing_count = 0
+        self.conflict_count = 0
+        skipped_invalid_count = 0
+        seen_usernames = set()
+        seen_emails = set()
+        batch = []
+
+        try:
+            with open(file_path, 'r', encoding='utf-8-sig', newline='') as f, transaction.atomic():
+                reader = csv.DictReader(f)
+                missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+                if missing:
+                    raise CommandError(f"File '{file_path}' is missing the column(s): {', '.join(missing)}.")
+
+                for row in reader:
+                    line_number = reader.line_num
+                    fields = {column: (row.get(column) or '').strip() for column in REQUIRED_COLUMNS + OPTIONAL_COLUMNS}
+                    error = self.clean_row(fields)
+                    if error:
+                        self.stdout.write(self.style.WARNING(f"Skipped line {line_number}: {error}"))
+                        skipped_invalid_count += 1
+                        continue
+                    if fields['username'] in seen_usernames or (fields['email'] and fields['email'] in seen_emails):
+                        self.stdout.write(self.style.WARNING(f"Skipped line {line_number}: username or email repeated earlier in the file."))
+                        skipped_invalid_count += 1
+                        continue
+                    seen_usernames.add(fields['username'])
+                    if fields['email']:
+                        seen_emails.add(fields['email'])
+                    batch.append(fields)
+
+                    if len(batch) >= self.batch_size:
+                        self.create_batch(batch)
+                        batch = []
+                if batch:
+                    self.create_batch(batch)
+        except FileNotFoundError:
+            raise CommandError(f"File '{file_path}' not found. Please make sure it exists.")
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            raise CommandError(f"Error reading file '{file_path}': {e}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Finished provisioning users. Created: {self.created_count}. Already existed: {self.existing_count}. "
+            f"Created concurrently (skipped): {self.conflict_count}. Skipped (invalid or repeated): {skipped_invalid_count}."
+        ))
+
+    def clean_row(self, fields):
+        """
+        Normalize `fields` in place. Return an error message if the row cannot be used.
+        """
+        fields['username'] = User.normalize_username(fields['username'])
+        fields['email'] = User.objects.normalize_email(fields['email'])
+        if not fields['username']:
+            return "empty username."
+        try:
+            User.username_validator(fields['username'])
+            if fields['email']:
+                validate_email(fields['email'])
+        except ValidationError as e:
+            return ' '.join(e.messages)
+        return None
+
+    def create_batch(self, batch):
+        # One query finds every username or email of the batch that is already taken
+        usernames = [fields['username'] for fields in batch]
+        emails = [fields['email'] for fields in batch if fields['email']]
+        taken_usernames = set()
+        taken_emails = set()
+        for username, email in User.objects.filter(Q(username__in=usernames) | Q(email__in=emails)).values_list('username', 'email'):
+            taken_usernames.add(username)
+            taken_emails.add(email)
+
+        new_rows = []
+        for fields in batch:
+            if fields['username'] in taken_usernames or (fields['email'] and fields['email'] in taken_emails):
+                self.existing_count += 1
+                if self.verbosity >= 2:
+                    self.stdout.write(self.style.NOTICE(f"User '{fields['username']}' already exists. Skipped."))
+                continue
+            new_rows.append(fields)
+
+        # Hash the whole batch in parallel in the bounded password pool
+        passwords = hash_passwords([fields['password'] or None for fields in new_rows])
+        users = [
+            User(
+                username=fields['username'],
+                email=fields['email'],
+                first_name=fields['first_name'],
+                last_name=fields['last_name'],
+                password=password,
+            )
+            for fields, password in zip(new_rows, passwords)
+        ]
+        # ignore_conflicts covers users registered concurrently since the lookup above
+        User.objects.bulk_create(users, batch_size=self.batch_size, ignore_conflicts=True)
+        # Password hashes are salted, so a row carrying our hash is one this batch inserted
+        stored = dict(User.objects.filter(username__in=[user.username for user in users]).values_list('username', 'password'))
+        for user in users:
+            if stored.get(user.username) == user.password:
+                self.created_count += 1
+                if self.verbosity >= 2:
+                    self.stdout.write(self.style.SUCCESS(f"Created: '{user.username}'"))
+            else:
+                self.conflict_count += 1
+                self.stdout.write(self.style.WARNING(f"User '{user.username}' was created concurrently by someone else. Skipped."))
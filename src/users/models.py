@@ -1,5 +1,6 @@
-from django.db import models
+from django.db import models, connections, transaction, IntegrityError
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 class DifficultyLevel(models.TextChoices):
     EASY = 'easy', 'Easy'
@@ -7,6 +8,63 @@ class DifficultyLevel(models.TextChoices):
     # Thêm các cấp độ khác nếu cần
     # HARD = 'hard', 'Hard'
 
+class HighScoreQuerySet(models.QuerySet):
+    def submit(self, user, difficulty, score):
+        """
+        Ghi `score` cho (user, difficulty) nếu nó cao hơn điểm hiện tại, trong một câu lệnh nguyên tử.
+        Trả về (highscore, changed); changed là True khi bản ghi vừa được tạo hoặc điểm vừa được nâng.
+        """
+        now = timezone.now()
+        connection = connections[self.db]
+        # ON CONFLICT ... RETURNING: PostgreSQL và SQLite 3.35+ (SQLite cũ hơn không có RETURNING)
+        if connection.vendor in ('postgresql', 'sqlite') and connection.features.can_return_columns_from_insert:
+            highscore_id = self._upsert_returning(user.pk, difficulty, score, now)
+            changed = highscore_id is not None
+        else:
+            highscore_id = None
+            changed = self.filter(user=user, difficulty=difficulty, score__lt=score).update(score=score, updated_at=now) > 0
+            if not changed:
+                try:
+                    with transaction.atomic(using=self.db):
+                        highscore_id = self.create(user=user, difficulty=difficulty, score=score).pk
+                    changed = True
+                except IntegrityError:
+                    # Request khác vừa tạo bản ghi; chỉ ghi đè nếu điểm của nó thấp hơn
+                    changed = self.filter(user=user, difficulty=difficulty, score__lt=score).update(score=score, updated_at=now) > 0
+
+        if highscore_id is not None:
+            return self.model(id=highscore_id, user=user, difficulty=difficulty, score=score, updated_at=now), True
+        # Điểm không cao hơn (hoặc backend không có RETURNING): đọc lại bản ghi hiện tại
+        return self.get(user=user, difficulty=difficulty), changed
+
+    def _upsert_returning(self, user_id, difficulty, score, now):
+        """
+        INSERT ... ON CONFLICT DO UPDATE ... WHERE score < new RETURNING id.
+        Trả về id nếu bản ghi được tạo hoặc cập nhật, None nếu điểm hiện tại đã cao hơn hoặc bằng.
+        """
+        connection = connections[self.db]
+        meta = self.model._meta
+        qn = connection.ops.quote_name
+        table = qn(meta.db_table)
+        user_id_col = qn(meta.get_field('user').column)
+        difficulty_col = qn(meta.get_field('difficulty').column)
+        score_col = qn(meta.get_field('score').column)
+        updated_at_col = qn(meta.get_field('updated_at').column)
+        sql = (
+            f"INSERT INTO {table} ({user_id_col}, {difficulty_col}, {score_col}, {updated_at_col}) "
+            f"VALUES (%s, %s, %s, %s) "
+            f"ON CONFLICT ({user_id_col}, {difficulty_col}) DO UPDATE "
+            f"SET {score_col} = excluded.{score_col}, {updated_at_col} = excluded.{updated_at_col} "
+            f"WHERE {table}.{score_col} < excluded.{score_col} "
+            f"RETURNING {qn(meta.pk.column)}"
+        )
+        params = [user_id, difficulty, score, connection.ops.adapt_datetimefield_value(now)]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+
 class HighScore(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='highscores') # Thay OneToOneField thành ForeignKey
     difficulty = models.CharField(
@@ -17,10 +75,16 @@ class HighScore(models.Model):
     score = models.IntegerField(default=0)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = HighScoreQuerySet.as_manager()
+
     class Meta:
         verbose_name = "High Score"
         verbose_name_plural = "High Scores"
         unique_together = ('user', 'difficulty') # Đảm bảo mỗi user chỉ có 1 high score cho mỗi difficulty
+        indexes = [
+            # Bảng xếp hạng: top-N theo difficulty đọc theo thứ tự index, không cần sort
+            models.Index(fields=['difficulty', '-score', 'updated_at'], name='users_hs_difficulty_score'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.get_difficulty_display()}: {self.score}"
\ No newline at end of file
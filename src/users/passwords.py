@@ -0,0 +1,28 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+# Số băm mật khẩu (PBKDF2) được chạy cùng lúc; request khác phải xếp hàng
+PASSWORD_HASH_WORKERS = getattr(settings, 'USERS_PASSWORD_HASH_WORKERS', max(1, (os.cpu_count() or 2) // 2))
+
+_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix='password-hash')
+
+
+def hash_password(raw_password):
+    """
+    Băm mật khẩu trong pool giới hạn PASSWORD_HASH_WORKERS thread.
+
+    Dưới ASGI mỗi request đồng bộ chạy trong thread riêng; nếu mọi request đăng ký cùng băm
+    thì chúng chiếm hết CPU của worker. Qua pool, chỉ tối đa PASSWORD_HASH_WORKERS lần băm chạy
+    song song (hashlib nhả GIL khi băm), các request đăng ký còn lại chờ mà không tốn CPU,
+    nên request quiz vẫn được phục vụ.
+    """
+    return _executor.submit(make_password, raw_password).result()
+
+
+def hash_passwords(raw_passwords):
+    """
+    Băm nhiều mật khẩu song song trong cùng pool, giữ nguyên thứ tự. None tạo mật khẩu không dùng được.
+    """
+    return list(_executor.map(make_password, raw_passwords))
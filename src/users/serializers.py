@@ -1,9 +1,27 @@
 from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q
 from rest_framework import serializers
 from .models import HighScore
+from .passwords import hash_password
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
+TAKEN_MESSAGES = {
+    'email': "Địa chỉ email này đã được sử dụng.",
+    'username': "Tên đăng nhập này đã tồn tại.",
+}
+
+def taken_fields(username, email):
+    """
+    Trả về dict {trường: thông báo lỗi} cho username/email đã được dùng, kiểm tra cả hai trong một truy vấn.
+    """
+    counts = User.objects.filter(Q(username=username) | Q(email=email)).aggregate(
+        email=Count('pk', filter=Q(email=email)),
+        username=Count('pk', filter=Q(username=username)),
+    )
+    return {field: message for field, message in TAKEN_MESSAGES.items() if counts[field]}
+
 class UserRegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(
         write_only=True,
@@ -26,6 +44,8 @@ class UserRegisterSerializer(serializers.ModelSerializer):
         # Các trường sẽ được sử dụng để tạo user và trả về (trừ password, password2)
         fields = ('username', 'password', 'password2', 'email', 'first_name', 'last_name')
         extra_kwargs = {
+            # Bỏ UniqueValidator mặc định: validate() kiểm tra username và email trong cùng một truy vấn
+            'username': {'validators': [User.username_validator]},
             'first_name': {'required': False, 'label': "Tên"},
             'last_name': {'required': False, 'label': "Họ"}
         }
@@ -34,26 +54,29 @@ class UserRegisterSerializer(serializers.ModelSerializer):
         if attrs['password'] != attrs['password2']:
             raise serializers.ValidationError({"password2": "Mật khẩu xác nhận không khớp."})
 
-        # Kiểm tra email đã tồn tại chưa
-        if User.objects.filter(email=attrs['email']).exists():
-            raise serializers.ValidationError({"email": "Địa chỉ email này đã được sử dụng."})
-
-        # Kiểm tra username đã tồn tại chưa
-        if User.objects.filter(username=attrs['username']).exists():
-            raise serializers.ValidationError({"username": "Tên đăng nhập này đã tồn tại."})
+        attrs['username'] = User.normalize_username(attrs['username'])
+        attrs['email'] = User.objects.normalize_email(attrs['email'])
+        # Kiểm tra username và email đã tồn tại chưa (một truy vấn)
+        taken = taken_fields(attrs['username'], attrs['email'])
+        if taken:
+            raise serializers.ValidationError(taken)
         return attrs
 
     def create(self, validated_data):
-        # Tạo user mới với password đã được hash
-        user = User.objects.create_user(
+        user = User(
             username=validated_data['username'],
             email=validated_data['email'],
-            password=validated_data['password'], # create_user sẽ hash mật khẩu
             first_name=validated_data.get('first_name', ''),
             last_name=validated_data.get('last_name', '')
         )
-        # Không cần gọi user.set_password() nữa vì create_user đã làm
-        # user.save() cũng không cần vì create_user đã lưu
+        # Băm trong pool giới hạn để đợt đăng ký dồn dập không chiếm hết CPU
+        user.password = hash_password(validated_data['password'])
+        try:
+            with transaction.atomic():
+                user.save()
+        except IntegrityError:
+            # Request khác vừa đăng ký cùng username (ràng buộc unique) sau khi validate() chạy
+            raise serializers.ValidationError(taken_fields(user.username, user.email) or {"username": TAKEN_MESSAGES['username']})
         return user
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
@@ -91,6 +114,14 @@ class HighScoreSerializer(serializers.ModelSerializer):
         model = HighScore
         fields = ['id', 'user', 'difficulty', 'score', 'updated_at']
 
+class HighScoreSummarySerializer(serializers.Serializer):
+    """
+    Serializer chỉ đọc cho điểm của một cấp độ, dùng với dict từ values() (updated_at là None nếu chưa có điểm).
+    """
+    difficulty = serializers.CharField()
+    score = serializers.IntegerField()
+    updated_at = serializers.DateTimeField(allow_null=True)
+
 class HighScoreUpdateSerializer(serializers.Serializer):
     """
     Serializer để xác thực dữ liệu đầu vào khi cập nhật score.
@@ -0,0 +1,19 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .leaderboard import leaderboard
+from .models import HighScore
+
+# HighScore.objects.submit() ghi bằng SQL trực tiếp nên không gửi signal; view tự cập nhật leaderboard.
+# Các receiver này bắt các thay đổi còn lại (admin, xóa user, ...), và chỉ cập nhật
+# leaderboard sau khi transaction commit, để một thay đổi bị rollback không lọt vào bảng xếp hạng.
+
+@receiver(post_save, sender=HighScore)
+def highscore_saved(sender, instance, **kwargs):
+    difficulty, user_id, score = instance.difficulty, instance.user_id, instance.score
+    transaction.on_commit(lambda: leaderboard.score_changed(difficulty, user_id, score))
+
+@receiver(post_delete, sender=HighScore)
+def highscore_deleted(sender, instance, **kwargs):
+    difficulty, user_id = instance.difficulty, instance.user_id
+    transaction.on_commit(lambda: leaderboard.score_deleted(difficulty, user_id))
@@ -1,3 +1,319 @@
-from django.test import TestCase
+import os
+import random
+import tempfile
+import threading
+import timeit
+from io import StringIO
+from unittest import mock, skipUnless
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.db import connection, transaction, DatabaseError, OperationalError
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+from .models import HighScore, DifficultyLevel
+from .leaderboard import ScoreRanking, leaderboard
+from .serializers import UserRegisterSerializer
 
 # Create your tests here.
+
+class HighScoreSubmitTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='player', password='pass12345')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('users_api:user-auth-user_highscore_level', kwargs={'difficulty_level': 'easy'})
+
+    def test_first_score_creates_row(self):
+        response = self.client.post(self.url, {'score': 7}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['score'], 7)
+        self.assertEqual(response.data['user'], {'id': self.user.id, 'username': 'player'})
+        self.assertEqual(HighScore.objects.get(user=self.user, difficulty='easy').score, 7)
+
+    def test_first_zero_score_returns_201(self):
+        response = self.client.post(self.url, {'score': 0}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['score'], 0)
+
+    def test_higher_score_replaces_and_lower_is_rejected(self):
+        HighScore.objects.create(user=self.user, difficulty='easy', score=10)
+        response = self.client.post(self.url, {'score': 15}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['score'], 15)
+
+        response = self.client.post(self.url, {'score': 12}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('message', response.data)
+        self.assertEqual(response.data['current_highscore']['score'], 15)
+        self.assertEqual(HighScore.objects.get(user=self.user, difficulty='easy').score, 15)
+
+    def test_equal_zero_score_on_existing_row_is_not_a_change(self):
+        HighScore.objects.create(user=self.user, difficulty='easy', score=0)
+        response = self.client.post(self.url, {'score': 0}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['current_highscore']['score'], 0)
+
+    def test_invalid_score_does_not_write(self):
+        response = self.client.post(self.url, {'score': -1}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(HighScore.objects.exists())
+
+    def test_submit_reports_change(self):
+        highscore, changed = HighScore.objects.submit(self.user, DifficultyLevel.MEDIUM, 5)
+        self.assertTrue(changed)
+        self.assertEqual((highscore.difficulty, highscore.score), ('medium', 5))
+        self.assertEqual(highscore.pk, HighScore.objects.get(user=self.user, difficulty='medium').pk)
+
+        highscore, changed = HighScore.objects.submit(self.user, DifficultyLevel.MEDIUM, 3)
+        self.assertFalse(changed)
+        self.assertEqual(highscore.score, 5)
+
+    def test_submit_without_returning_support(self):
+        with mock.patch.object(connection.features, 'can_return_columns_from_insert', False):
+            highscore, changed = HighScore.objects.submit(self.user, DifficultyLevel.EASY, 5)
+            self.assertTrue(changed)
+            self.assertEqual(highscore.score, 5)
+            self.assertEqual(HighScore.objects.submit(self.user, DifficultyLevel.EASY, 9)[1], True)
+            highscore, changed = HighScore.objects.submit(self.user, DifficultyLevel.EASY, 7)
+        self.assertFalse(changed)
+        self.assertEqual(highscore.score, 9)
+        self.assertEqual(HighScore.objects.get(user=self.user, difficulty='easy').score, 9)
+
+    def test_new_high_score_is_one_query(self):
+        HighScore.objects.create(user=self.user, difficulty='easy', score=10)
+        with CaptureQueriesContext(connection) as queries:
+            _, changed = HighScore.objects.submit(self.user, DifficultyLevel.EASY, 20)
+        self.assertTrue(changed)
+        self.assertEqual(len(queries), 1)
+
+
+class HighScoreConcurrencyTests(TransactionTestCase):
+    def test_concurrent_submissions_keep_the_highest_score(self):
+        user = User.objects.create_user(username='racer', password='pass12345')
+        scores = list(range(1, 41))
+        barrier = threading.Barrier(len(scores))
+        errors = []
+
+        def submit(score):
+            try:
+                barrier.wait()
+                while True:
+                    try:
+                        HighScore.objects.submit(user, DifficultyLevel.EASY, score)
+                        break
+                    except OperationalError as e:
+                        # The in-memory SQLite test database has no busy timeout: a locked
+                        # table fails the statement instead of waiting, so retry it
+                        if 'locked' not in str(e):
+                            raise
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=submit, args=(score,)) for score in reversed(scores)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(HighScore.objects.filter(user=user).count(), 1)
+        self.assertEqual(HighScore.objects.get(user=user).score, max(scores))
+
+
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        leaderboard.mark_stale()
+        self.users = [User.objects.create_user(username=f'p{i}', password='pass12345') for i in range(5)]
+        for user, score in zip(self.users, [50, 80, 80, 20, 10]):
+            HighScore.objects.create(user=user, difficulty='easy', score=score)
+        self.client = APIClient()
+        self.top_url = reverse('users_api:user-auth-leaderboard', kwargs={'difficulty_level': 'easy'})
+        self.me_url = reverse('users_api:user-auth-leaderboard_me', kwargs={'difficulty_level': 'easy'})
+
+    def test_top_n_with_tied_ranks(self):
+        data = self.client.get(self.top_url, {'limit': 4}).json()
+        self.assertEqual([(r['user']['username'], r['score'], r['rank']) for r in data['results']],
+                         [('p1', 80, 1), ('p2', 80, 1), ('p0', 50, 3), ('p3', 20, 4)])
+        self.assertEqual(self.client.get(self.top_url, {'limit': 0}).status_code, 400)
+        self.assertEqual(self.client.get(self.top_url, {'limit': 'x'}).status_code, 400)
+
+    def test_my_rank_follows_submissions(self):
+        self.client.force_authenticate(self.users[4])
+        data = self.client.get(self.me_url).json()
+        self.assertEqual((data['score'], data['rank'], data['total_players'], data['percentile']), (10, 5, 5, 20.0))
+
+        highscore_url = reverse('users_api:user-auth-user_highscore_level', kwargs={'difficulty_level': 'easy'})
+        self.client.post(highscore_url, {'score': 90}, format='json')
+        data = self.client.get(self.me_url).json()
+        self.assertEqual((data['score'], data['rank'], data['percentile']), (90, 1, 100.0))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            HighScore.objects.filter(user=self.users[1]).delete()
+        self.assertEqual(self.client.get(self.me_url).json()['total_players'], 4)
+
+    def test_submissions_applied_out_of_order_keep_the_higher_score(self):
+        self.assertEqual(leaderboard.standing('easy', self.users[4].pk), (10, 5, 5, 20.0))
+        # Two requests submit 80 then 90, but their leaderboard updates arrive in reverse order
+        leaderboard.score_submitted('easy', self.users[4].pk, 90)
+        leaderboard.score_submitted('easy', self.users[4].pk, 80)
+        self.assertEqual(leaderboard.standing('easy', self.users[4].pk)[:2], (90, 1))
+
+    def test_rolled_back_change_does_not_reach_the_ranking(self):
+        self.assertEqual(leaderboard.standing('easy', self.users[3].pk)[:2], (20, 4))
+        highscore = HighScore.objects.get(user=self.users[3])
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    highscore.score = 100
+                    highscore.save()
+                    raise DatabaseError("rollback")
+            except DatabaseError:
+                pass
+        self.assertEqual(callbacks, [])
+        self.assertEqual(leaderboard.standing('easy', self.users[3].pk)[:2], (20, 4))
+
+    def test_user_without_score_has_no_rank(self):
+        self.client.force_authenticate(self.users[0])
+        medium_url = reverse('users_api:user-auth-leaderboard_me', kwargs={'difficulty_level': 'medium'})
+        data = self.client.get(medium_url).json()
+        self.assertEqual((data['score'], data['rank'], data['percentile']), (0, None, None))
+        self.assertFalse(HighScore.objects.filter(difficulty='medium').exists())
+
+    def test_me_requires_authentication(self):
+        self.assertEqual(self.client.get(self.me_url).status_code, 401)
+
+    @skipUnless(os.environ.get('RUN_BENCHMARKS'), "timing benchmark; set RUN_BENCHMARKS=1 to run it")
+    def test_benchmark_1m_players(self):
+        rng = random.Random(23)
+        ranking = ScoreRanking((user_id, rng.randint(0, 100000)) for user_id in range(1000000))
+        user_ids = rng.sample(range(1000000), 200)
+
+        def my_rank():
+            for user_id in user_ids:
+                score = ranking.score_of(user_id)
+                ranking.rank(score), ranking.percentile(score)
+
+        per_query = min(timeit.repeat(my_rank, number=1, repeat=3)) / len(user_ids)
+        self.assertLess(per_query, 0.001)
+
+        per_update = min(timeit.repeat(lambda: [ranking.set_score(user_id, rng.randint(0, 100000)) for user_id in user_ids], number=1, repeat=3)) / len(user_ids)
+        self.assertLess(per_update, 0.005)
+        self.assertEqual(len(ranking), 1000000)
+
+
+class AllHighScoresTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='player', password='pass12345')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('users_api:user-auth-user_highscores')
+
+    def test_all_difficulties_in_one_query_without_writes(self):
+        HighScore.objects.create(user=self.user, difficulty='medium', score=42)
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get(self.url).json()
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(list(data['highscores']), DifficultyLevel.values)
+        self.assertEqual(data['highscores']['medium']['score'], 42)
+        self.assertEqual(data['highscores']['easy'], {'difficulty': 'easy', 'score': 0, 'updated_at': None})
+        self.assertEqual(HighScore.objects.count(), 1)
+
+    def test_level_get_does_not_create_rows(self):
+        url = reverse('users_api:user-auth-user_highscore_level', kwargs={'difficulty_level': 'easy'})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['score'], 0)
+        self.assertFalse(HighScore.objects.exists())
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+
+class RegisterTests(TestCase):
+    def setUp(self):
+        self.url = reverse('users_api:user-auth-register')
+        self.data = {'username': 'newbie', 'email': 'newbie@example.com', 'password': 'S3cure-pass!', 'password2': 'S3cure-pass!'}
+        User.objects.create_user(username='taken', email='taken@example.com', password='pass12345')
+
+    def test_register_hashes_password(self):
+        response = APIClient().post(self.url, self.data, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(User.objects.get(username='newbie').check_password('S3cure-pass!'))
+
+    def test_uniqueness_is_checked_in_one_query(self):
+        serializer = UserRegisterSerializer(data=dict(self.data, username='taken', email='taken@EXAMPLE.com'))
+        with CaptureQueriesContext(connection) as queries:
+            self.assertFalse(serializer.is_valid())
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(set(serializer.errors), {'username', 'email'})
+
+    def test_race_on_username_becomes_validation_error(self):
+        serializer = UserRegisterSerializer(data=self.data)
+        self.assertTrue(serializer.is_valid())
+        # Another request registers the same username after validation
+        User.objects.create_user(username='newbie', password='pass12345')
+        with self.assertRaises(ValidationError) as raised:
+            serializer.save()
+        self.assertIn('username', raised.exception.detail)
+        self.assertEqual(User.objects.filter(username='newbie').count(), 1)
+
+
+class ProvisionUsersCommandTests(TestCase):
+    def write_roster(self, content):
+        f = tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8')
+        f.write(content)
+        f.close()
+        self.addCleanup(os.remove, f.name)
+        return f.name
+
+    def test_creates_users_in_batches_and_skips_existing(self):
+        User.objects.create_user(username='old', email='old@example.com')
+        path = self.write_roster(
+            "username,email,first_name,last_name,password\n"
+            "an,an@example.com,An,Nguyen,Pass-word-1\n"
+            "binh,,Binh,Tran,\n"
+            "old,new@example.com,,,\n"
+            "other,old@example.com,,,\n"
+            "an,again@example.com,,,\n"
+            "bad name!,x@example.com,,,\n"
+            "chi,chi@example.com,Chi,Le,Pass-word-3\n"
+        )
+        out = StringIO()
+        with CaptureQueriesContext(connection) as queries:
+            call_command('provision_users', path, '--batch-size', '2', stdout=out)
+        self.assertIn("Created: 3. Already existed: 2. Created concurrently (skipped): 0. Skipped (invalid or repeated): 2.", out.getvalue())
+        # 3 batches: one lookup, one insert and one check each, plus the transaction savepoint
+        self.assertLessEqual(len(queries), 11)
+        an = User.objects.get(username='an')
+        self.assertEqual((an.email, an.first_name, an.last_name), ('an@example.com', 'An', 'Nguyen'))
+        self.assertTrue(an.check_password('Pass-word-1'))
+        self.assertFalse(User.objects.get(username='binh').has_usable_password())
+        self.assertFalse(User.objects.filter(username='other').exists())
+
+    def test_users_created_concurrently_are_not_counted(self):
+        path = self.write_roster("username,email\nan,an@example.com\nbinh,binh@example.com\n")
+        bulk_create = User.objects.bulk_create
+
+        def insert_an_first(users, **kwargs):
+            # Someone registers "an" between the lookup and the insert
+            User.objects.create_user(username='an', email='other@example.com')
+            return bulk_create(users, **kwargs)
+
+        out = StringIO()
+        with mock.patch.object(User.objects, 'bulk_create', side_effect=insert_an_first):
+            call_command('provision_users', path, stdout=out)
+        self.assertIn("Created: 1. Already existed: 0. Created concurrently (skipped): 1.", out.getvalue())
+        self.assertEqual(User.objects.get(username='an').email, 'other@example.com')
+
+    def test_missing_column_or_file(self):
+        with self.assertRaises(CommandError):
+            call_command('provision_users', self.write_roster("email\na@example.com\n"), stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command('provision_users', 'no-such-roster.csv', stdout=StringIO())
@@ -2,10 +2,16 @@ from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.decorators import action
-from .serializers import UserRegisterSerializer, HighScoreSerializer, HighScoreUpdateSerializer
+from .serializers import UserRegisterSerializer, HighScoreSerializer, HighScoreSummarySerializer, HighScoreUpdateSerializer
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth.models import User # User model đã được import
 from .models import HighScore, DifficultyLevel # Import DifficultyLevel
+from .leaderboard import leaderboard
+
+# Regex cho tham số difficulty_level trong URL, tự cập nhật khi DifficultyLevel có thêm cấp độ
+DIFFICULTY_PATTERN = '|'.join(DifficultyLevel.values)
+LEADERBOARD_DEFAULT_LIMIT = 10
+LEADERBOARD_MAX_LIMIT = 100
 
 class UserViewSet(viewsets.GenericViewSet):
     """
@@ -33,39 +39,37 @@ class UserViewSet(viewsets.GenericViewSet):
             return Response({ "user": user_data, "refresh_token": str(refresh), "access_token": str(refresh.access_token), "message": "Đăng ký tài khoản thành công!" }, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-    def _get_or_create_highscore(self, user, difficulty_level):
-        # Validate difficulty_level (mặc dù regex trong URL đã làm một phần)
-        valid_difficulties = [choice[0] for choice in DifficultyLevel.choices]
-        if difficulty_level not in valid_difficulties:
-            # Điều này không nên xảy ra nếu regex URL đúng, nhưng để an toàn
-            raise ValueError(f"Invalid difficulty level: {difficulty_level}")
-
-        highscore, created = HighScore.objects.get_or_create(
-            user=user,
-            difficulty=difficulty_level,
-            defaults={'score': 0}
-        )
-        return highscore, created
+    @action(detail=False, methods=['get'], url_path='highscore',
+            permission_classes=[IsAuthenticated], url_name='user_highscores')
+    def highscores(self, request):
+        """
+        Lấy high score của user cho mọi cấp độ trong một truy vấn, không tạo bản ghi nào.
+        Cấp độ chưa có điểm được trả về với score 0.
+        """
+        rows = {row['difficulty']: row for row in request.user.highscores.values('difficulty', 'score', 'updated_at')}
+        highscores = {
+            difficulty: HighScoreSummarySerializer(rows.get(difficulty, {'difficulty': difficulty, 'score': 0, 'updated_at': None})).data
+            for difficulty in DifficultyLevel.values
+        }
+        return Response({"user": {"id": request.user.id, "username": request.user.username}, "highscores": highscores})
 
-    @action(detail=False, methods=['get', 'post'], url_path=r'highscore/(?P<difficulty_level>(easy|medium))',
+    @action(detail=False, methods=['get', 'post'], url_path=rf'highscore/(?P<difficulty_level>({DIFFICULTY_PATTERN}))',
             permission_classes=[IsAuthenticated], url_name='user_highscore_level') # Đặt tên cụ thể cho URL
     def highscore_level_manager(self, request, difficulty_level=None):
         """
         Lấy (GET) hoặc cập nhật (POST) high score của user cho một cấp độ cụ thể.
         """
         if request.method == 'GET':
-            try:
-                highscore, _ = self._get_or_create_highscore(request.user, difficulty_level)
-            except ValueError as e: # Bắt lỗi từ _get_or_create_highscore nếu difficulty không hợp lệ
-                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            # Chỉ đọc: chưa có điểm thì trả về điểm 0 mà không tạo bản ghi
+            highscore = HighScore.objects.filter(user=request.user, difficulty=difficulty_level).first()
+            if highscore is None:
+                highscore = HighScore(user=request.user, difficulty=difficulty_level, score=0)
             serializer = HighScoreSerializer(highscore)
             return Response(serializer.data)
         
         elif request.method == 'POST':
-            try:
-                highscore, hs_just_created = self._get_or_create_highscore(request.user, difficulty_level)
-            except ValueError as e:
-                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            if difficulty_level not in DifficultyLevel.values:
+                return Response({"error": f"Invalid difficulty level: {difficulty_level}"}, status=status.HTTP_400_BAD_REQUEST)
 
             input_serializer = HighScoreUpdateSerializer(data=request.data)
             if not input_serializer.is_valid():
@@ -73,21 +77,57 @@ class UserViewSet(viewsets.GenericViewSet):
             
             new_score = input_serializer.validated_data['score']
 
-            if new_score > highscore.score:
-                highscore.score = new_score
-                highscore.save()
-                output_serializer = HighScoreSerializer(highscore)
+            # So sánh và ghi trong cùng một câu lệnh, nên hai request đồng thời không thể ghi đè điểm cao hơn
+            highscore, changed = HighScore.objects.submit(request.user, difficulty_level, new_score)
+            output_serializer = HighScoreSerializer(highscore)
+            if changed:
+                leaderboard.score_submitted(difficulty_level, request.user.pk, highscore.score)
+                # Điểm 0 chỉ "thay đổi" được khi bản ghi vừa được tạo (điểm hiện có không thể < 0)
+                if new_score == 0:
+                    return Response(output_serializer.data, status=status.HTTP_201_CREATED)
                 return Response(output_serializer.data, status=status.HTTP_200_OK)
-            else: # Điểm mới không cao hơn
-                output_serializer = HighScoreSerializer(highscore)
-                # Nếu record vừa được tạo và điểm mới bằng điểm mặc định (ví dụ: post score 0)
-                if hs_just_created and new_score == highscore.score:
-                     return Response(output_serializer.data, status=status.HTTP_201_CREATED)
-                
-                return Response({
-                    "message": "Điểm mới không cao hơn điểm hiện tại.",
-                    "current_highscore": output_serializer.data
-                }, status=status.HTTP_200_OK)
+
+            return Response({
+                "message": "Điểm mới không cao hơn điểm hiện tại.",
+                "current_highscore": output_serializer.data
+            }, status=status.HTTP_200_OK)
         
         # Fallback, though should not be reached if methods are correctly specified in @action
-        return Response({"detail": "Method not allowed."}, status=status.HTTP_405_METHOD_NOT_ALLOWED)
\ No newline at end of file
+        return Response({"detail": "Method not allowed."}, status=status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    @action(detail=False, methods=['get'], url_path=rf'leaderboard/(?P<difficulty_level>({DIFFICULTY_PATTERN}))',
+            url_name='leaderboard')
+    def leaderboard_top(self, request, difficulty_level=None):
+        """
+        Top-N high score của một cấp độ (?limit=, mặc định 10, tối đa 100).
+        """
+        try:
+            limit = int(request.query_params.get('limit', LEADERBOARD_DEFAULT_LIMIT))
+        except ValueError:
+            return Response({"error": "limit phải là số nguyên."}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= limit <= LEADERBOARD_MAX_LIMIT:
+            return Response({"error": f"limit phải nằm trong khoảng 1-{LEADERBOARD_MAX_LIMIT}."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Đọc theo index (difficulty, -score, updated_at): bằng điểm thì ai đạt trước đứng trước
+        top = HighScore.objects.filter(difficulty=difficulty_level).select_related('user').order_by('-score', 'updated_at')[:limit]
+        results = []
+        for highscore in top:
+            entry = HighScoreSerializer(highscore).data
+            entry['rank'] = leaderboard.rank(difficulty_level, highscore.score)
+            results.append(entry)
+        return Response({"difficulty": difficulty_level, "results": results})
+
+    @action(detail=False, methods=['get'], url_path=rf'leaderboard/(?P<difficulty_level>({DIFFICULTY_PATTERN}))/me',
+            permission_classes=[IsAuthenticated], url_name='leaderboard_me')
+    def leaderboard_me(self, request, difficulty_level=None):
+        """
+        Hạng và percentile của user hiện tại ở một cấp độ, tính từ bảng xếp hạng trong bộ nhớ.
+        """
+        score, rank, total_players, percentile = leaderboard.standing(difficulty_level, request.user.pk)
+        return Response({
+            "difficulty": difficulty_level,
+            "score": score or 0,
+            "rank": rank,
+            "total_players": total_players,
+            "percentile": round(percentile, 2) if percentile is not None else None,
+        })
\ No newline at end of file
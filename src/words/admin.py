@@ -11,4 +11,5 @@ class EnglishWordAdmin(admin.ModelAdmin):
         'vietnamese_translation_4', 
         'vietnamese_translation_5'
     )
-    search_fields = ('english_word', 'vietnamese_translation_1', 'vietnamese_translation_2', 'vietnamese_translation_3', 'vietnamese_translation_4', 'vietnamese_translation_5')
\ No newline at end of file
+    # translations__text covers every meaning, including those after the fifth
+    search_fields = ('english_word', 'translations__text')
\ No newline at end of file
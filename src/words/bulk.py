@@ -0,0 +1,92 @@
+from django.db import transaction
+from rest_framework import serializers
+from .cache import invalidate_words
+from .catalog import deferred_catalog_bumps
+from .models import EnglishWord, replace_translations
+from .serializers import BulkWordItemSerializer
+from .utils import TRANSLATION_FIELDS
+
+CREATED = 'created'
+UPDATED = 'updated'
+UNCHANGED = 'unchanged'
+DELETED = 'deleted'
+NOT_FOUND = 'not_found'
+ERROR = 'error'
+
+
+def write_words(items, batch_size=1000):
+    """
+    Apply bulk word upserts/deletes (see BulkWordItemSerializer) in one transaction.
+
+    Items are validated and looked up a batch at a time (one in_bulk() query per batch) and
+    written with bulk_create/bulk_update/one DELETE per batch. Invalid items and repeated
+    english_words are reported and skipped; the rest are applied.
+    Returns one {"index", "english_word", "status", ...} dict per item, in input order.
+    """
+    validator = BulkWordItemSerializer()
+    results = [None] * len(items)
+    seen = set()
+    touched_ids = []
+    with transaction.atomic(), deferred_catalog_bumps():
+        for start in range(0, len(items), batch_size):
+            batch = {}
+            for index in range(start, min(start + batch_size, len(items))):
+                item = items[index]
+                try:
+                    data = validator.run_validation(item)
+                except serializers.ValidationError as exc:
+                    english_word = item.get('english_word') if isinstance(item, dict) else None
+                    results[index] = {"index": index, "english_word": english_word, "status": ERROR, "errors": exc.detail}
+                    continue
+                if data['english_word'] in seen:
+                    results[index] = {
+                        "index": index, "english_word": data['english_word'], "status": ERROR,
+                        "errors": {"english_word": ["This word appears more than once in the request."]},
+                    }
+                    continue
+                seen.add(data['english_word'])
+                batch[data['english_word']] = (index, data)
+            touched_ids.extend(_write_batch(batch, results))
+    invalidate_words(touched_ids)
+    return results
+
+
+def _write_batch(batch, results):
+    existing = EnglishWord.objects.in_bulk(list(batch), field_name='english_word')
+    to_create, to_update, to_delete = [], [], []
+    for english_word, (index, data) in batch.items():
+        word = existing.get(english_word)
+        result = {"index": index, "english_word": english_word}
+        results[index] = result
+        if data['op'] == BulkWordItemSerializer.DELETE:
+            if word is None:
+                result["status"] = NOT_FOUND
+            else:
+                result.update(id=word.pk, status=DELETED)
+                to_delete.append(word.pk)
+            continue
+
+        if word is None:
+            word = EnglishWord(english_word=english_word)
+        old_hash = word.content_hash
+        word.set_translations(data.get('translations') or [data.get(field) for field in TRANSLATION_FIELDS])
+        word.fill_content_hash()
+        if word.pk is None:
+            to_create.append((result, word))
+        elif word.content_hash == old_hash:
+            result.update(id=word.pk, status=UNCHANGED)
+        else:
+            result.update(id=word.pk, status=UPDATED)
+            to_update.append(word)
+
+    created = [word for _, word in to_create]
+    EnglishWord.objects.bulk_create(created)
+    EnglishWord.objects.bulk_update(to_update, TRANSLATION_FIELDS + ['content_hash'])
+    # Also fills in the pks of created words on backends where bulk_create() does not
+    replace_translations(created + to_update)
+    if to_delete:
+        EnglishWord.objects.filter(pk__in=to_delete).delete()
+
+    for result, word in to_create:
+        result.update(id=word.pk, status=CREATED)
+    return [word.pk for word in created + to_update] + to_delete
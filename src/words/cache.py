@@ -0,0 +1,123 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from django.conf import settings
+from django.db import transaction
+from .indexes import mark_all_indexes_stale
+from .catalog import bump_catalog_version
+
+# What grading needs to know about a word: its raw meanings (for display) and their
+# normalized forms (for comparison), in the same order, primary meaning first.
+AnswerKey = namedtuple('AnswerKey', ['english_word', 'translations', 'normalized'])
+
+
+def build_answer_key(word):
+    meanings = word.get_meanings()
+    return AnswerKey(
+        english_word=word.english_word,
+        translations=tuple(raw for _, raw, _ in meanings),
+        normalized=tuple(normalized for _, _, normalized in meanings),
+    )
+
+
+class AnswerKeyCache:
+    """
+    Process-local LRU cache of AnswerKey objects keyed by word id, with a TTL.
+    Entries are dropped on EnglishWord save/delete (see words/signals.py) and
+    the whole cache is cleared by bulk operations such as clear_words.
+    """
+
+    def __init__(self, maxsize=10000, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, word_id):
+        key = str(word_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, word_id, answer_key):
+        key = str(word_id)
+        with self._lock:
+            self._entries[key] = (answer_key, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, word_id):
+        with self._lock:
+            self._entries.pop(str(word_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
+
+
+_cache_settings = getattr(settings, 'WORDS_ANSWER_KEY_CACHE', {})
+answer_key_cache = AnswerKeyCache(
+    maxsize=_cache_settings.get('MAXSIZE', 10000),
+    ttl=_cache_settings.get('TTL', 300),
+)
+
+
+def get_answer_key(word_id, load_word):
+    """
+    Return the AnswerKey of a word, calling load_word() to fetch the word on a cache miss.
+    Exceptions raised by load_word() (DoesNotExist, Http404, ...) propagate to the caller.
+    """
+    answer_key = answer_key_cache.get(word_id)
+    if answer_key is None:
+        word = load_word()
+        answer_key = build_answer_key(word)
+        answer_key_cache.set(word.pk, answer_key)
+    return answer_key
+
+
+def clear_word_caches():
+    """
+    Drop every process-local structure derived from EnglishWord rows and bump the catalog
+    version (ETags). Call after bulk operations that bypass model signals (queryset updates,
+    truncation, ...).
+    """
+    answer_key_cache.clear()
+    mark_all_indexes_stale()
+    bump_catalog_version()
+
+
+def invalidate_words(word_ids):
+    """
+    Once the current transaction commits, drop cached answer keys for the given words and
+    mark the derived indexes stale. For bulk writes (bulk_create/bulk_update) that do not
+    send post_save.
+    """
+    word_ids = list(word_ids)
+
+    def invalidate():
+        for word_id in word_ids:
+            answer_key_cache.invalidate(word_id)
+        mark_all_indexes_stale()
+
+    transaction.on_commit(invalidate)
+    bump_catalog_version()
@@ -0,0 +1,54 @@
+import threading
+from contextlib import contextmanager
+from django.db.models import F
+from django.utils import timezone
+from .models import WordCatalogVersion
+
+CATALOG_VERSION_PK = 1
+_deferred = threading.local()
+
+
+def get_catalog_version():
+    """
+    Return (version, updated_at) of the word catalog.
+    """
+    catalog, _ = WordCatalogVersion.objects.get_or_create(
+        pk=CATALOG_VERSION_PK, defaults={'updated_at': timezone.now()}
+    )
+    return catalog.version, catalog.updated_at
+
+
+def bump_catalog_version():
+    """
+    Record that words were added, changed or deleted, so clients holding an old ETag refetch.
+    A single UPDATE; the row is created on first use.
+    """
+    updated = WordCatalogVersion.objects.filter(pk=CATALOG_VERSION_PK).update(
+        version=F('version') + 1, updated_at=timezone.now()
+    )
+    if not updated:
+        catalog, created = WordCatalogVersion.objects.get_or_create(
+            pk=CATALOG_VERSION_PK, defaults={'version': 1, 'updated_at': timezone.now()}
+        )
+        if not created:
+            # Created concurrently between the UPDATE and get_or_create()
+            WordCatalogVersion.objects.filter(pk=CATALOG_VERSION_PK).update(
+                version=F('version') + 1, updated_at=timezone.now()
+            )
+
+
+@contextmanager
+def deferred_catalog_bumps():
+    """
+    Inside this block the model signals do not bump the catalog version once per deleted or
+    saved word. Bulk code uses it and bumps once afterwards (invalidate_words() does).
+    """
+    _deferred.depth = getattr(_deferred, 'depth', 0) + 1
+    try:
+        yield
+    finally:
+        _deferred.depth -= 1
+
+
+def catalog_bumps_deferred():
+    return getattr(_deferred, 'depth', 0) > 0
@@ -0,0 +1,90 @@
+"""
+Streaming exports of the EnglishWord table. Each generator reads rows with
+QuerySet.iterator() and yields encoded chunks of EXPORT_CHUNK_ROWS rows, so memory use
+does not depend on the size of the table.
+"""
+import csv
+import io
+import json
+import zlib
+from .models import EnglishWord
+from .serializers import WORD_COLUMNS, WORD_FIELDS, word_dicts
+from .wordlist import format_line
+
+WORDLIST = 'wordlist'
+NDJSON = 'ndjson'
+CSV = 'csv'
+EXPORT_CHUNK_ROWS = 2000
+
+CONTENT_TYPES = {
+    WORDLIST: 'text/plain; charset=utf-8',
+    NDJSON: 'application/x-ndjson',
+    CSV: 'text/csv; charset=utf-8',
+}
+EXTENSIONS = {WORDLIST: 'txt', NDJSON: 'ndjson', CSV: 'csv'}
+
+
+def _word_chunks():
+    """
+    Lists of up to EXPORT_CHUNK_ROWS words in the words API format (see word_dicts).
+    """
+    rows = EnglishWord.objects.order_by('pk').values(*WORD_COLUMNS).iterator(chunk_size=EXPORT_CHUNK_ROWS)
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == EXPORT_CHUNK_ROWS:
+            yield word_dicts(chunk)
+            chunk = []
+    if chunk:
+        yield word_dicts(chunk)
+
+
+def iter_wordlist():
+    """
+    Lines in the `english__vi1--vi2` format read by load_words and populate_words.
+    """
+    for chunk in _word_chunks():
+        yield ''.join(format_line(word['english_word'], word['translations']) + '\n' for word in chunk).encode('utf-8')
+
+
+def iter_ndjson():
+    """
+    One JSON object per line, with the same fields and values as the words API.
+    """
+    for chunk in _word_chunks():
+        yield ''.join(json.dumps(word, ensure_ascii=False, separators=(',', ':')) + '\n' for word in chunk).encode('utf-8')
+
+
+def iter_csv():
+    """
+    A header row with the words API field names, then one row per word. 'translations' is
+    written as 'vi1--vi2--...', like in wordlist files.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(WORD_FIELDS)
+    for chunk in _word_chunks():
+        writer.writerows(
+            [word[field] for field in WORD_COLUMNS] + ['--'.join(word['translations'])] for word in chunk
+        )
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # Empty table: only the header
+        yield buffer.getvalue().encode('utf-8')
+
+
+def gzip_stream(chunks):
+    """
+    Gzip-compress a stream of byte chunks on the fly.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+EXPORTERS = {WORDLIST: iter_wordlist, NDJSON: iter_ndjson, CSV: iter_csv}
@@ -0,0 +1,189 @@
+from django.conf import settings
+from .indexes import WordIndex
+from .models import iter_word_meanings
+
+_fuzzy_settings = getattr(settings, 'WORDS_FUZZY_MATCH', {})
+# Largest edit distance a client may ask for when grading or looking up suggestions.
+MAX_EDIT_DISTANCE = _fuzzy_settings.get('MAX_DISTANCE', 2)
+
+
+def levenshtein(a, b):
+    """
+    Edit distance (insertions, deletions, substitutions) between two strings.
+    Uses Myers' bit-parallel algorithm: one pass over the longer string with the
+    shorter one encoded as bit masks, instead of a full dynamic-programming table.
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    m = len(b)
+    if m == 0:
+        return len(a)
+
+    peq = {}
+    for i, char in enumerate(b):
+        peq[char] = peq.get(char, 0) | (1 << i)
+    full = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv, mv, score = full, 0, m
+    for char in a:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = (ph << 1) | 1
+        mh <<= 1
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv & full
+    return score
+
+
+def accepted_distance(answer, target, max_distance):
+    """
+    Edit distance between two normalized strings if it is acceptable for grading, else None.
+    Acceptable means at most `max_distance` edits, covering at most a third of `target`,
+    so short answers cannot be accepted by typos alone.
+    """
+    if answer == target:
+        return 0
+    if max_distance <= 0 or abs(len(answer) - len(target)) > max_distance:
+        return None
+    distance = levenshtein(answer, target)
+    if distance <= max_distance and distance * 3 <= len(target):
+        return distance
+    return None
+
+
+def closest_match(answer, targets, max_distance):
+    """
+    Return (index, distance) of the closest acceptable target, or (None, None).
+    """
+    best = (None, None)
+    for i, target in enumerate(targets):
+        distance = accepted_distance(answer, target, max_distance)
+        if distance is not None and (best[1] is None or distance < best[1]):
+            best = (i, distance)
+    return best
+
+
+def _segments(length, segment_count):
+    """
+    Split a string length into `segment_count` near-equal (start, size) segments.
+    """
+    base, extra = divmod(length, segment_count)
+    segments = []
+    start = 0
+    for i in range(segment_count):
+        size = base + (1 if i >= segment_count - extra else 0)
+        segments.append((start, size))
+        start += size
+    return segments
+
+
+class SegmentIndex:
+    """
+    Index for "all terms within edit distance n" queries (pigeonhole / Pass-Join filter).
+
+    Every term is cut into max_distance + 1 segments and indexed by (length, segment number,
+    segment text). A term within n <= max_distance edits of the query keeps at least one
+    segment intact, shifted by at most n positions, so a query only probes a few dozen
+    substrings of itself and verifies the candidates with levenshtein().
+    """
+
+    def __init__(self, max_distance=2):
+        self.max_distance = max_distance
+        self.segment_count = max_distance + 1
+        self.terms = set()
+        self._postings = {}
+
+    def __len__(self):
+        return len(self.terms)
+
+    def add(self, term):
+        if term in self.terms:
+            return
+        self.terms.add(term)
+        for i, (start, size) in enumerate(_segments(len(term), self.segment_count)):
+            self._postings.setdefault((len(term), i, term[start:start + size]), []).append(term)
+
+    def search(self, term, max_distance):
+        """
+        Return [(distance, term)] for all indexed terms within max_distance, closest first.
+        """
+        max_distance = min(max_distance, self.max_distance)
+        length = len(term)
+        candidates = set()
+        for candidate_length in range(max(0, length - max_distance), length + max_distance + 1):
+            for i, (start, size) in enumerate(_segments(candidate_length, self.segment_count)):
+                first = max(0, start - max_distance)
+                last = min(length - size, start + max_distance)
+                for position in range(first, last + 1):
+                    candidates.update(self._postings.get((candidate_length, i, term[position:position + size]), ()))
+
+        matches = []
+        for candidate in candidates:
+            distance = levenshtein(term, candidate)
+            if distance <= max_distance:
+                matches.append((distance, candidate))
+        matches.sort()
+        return matches
+
+
+class MeaningIndex(WordIndex):
+    """
+    SegmentIndex over the normalized meanings of all words, plus a map from each normalized
+    meaning to the words that have it. Saves and deletes update it in place; terms that
+    lose all their words stay indexed but are skipped by suggest().
+    """
+
+    def build(self):
+        data = {'terms': SegmentIndex(MAX_EDIT_DISTANCE), 'words_by_term': {}, 'terms_by_word': {}}
+        for word_id, english_word, meanings in iter_word_meanings():
+            self._add_word(data, word_id, english_word, meanings)
+        return data
+
+    def _add_word(self, data, word_id, english_word, meanings):
+        terms = []
+        for raw, term in meanings:
+            if not term:
+                continue
+            if term not in data['words_by_term']:
+                data['terms'].add(term)
+                data['words_by_term'][term] = {}
+            data['words_by_term'][term][word_id] = (english_word, raw)
+            terms.append(term)
+        data['terms_by_word'][word_id] = terms
+
+    def apply_delete(self, data, word_id):
+        for term in data['terms_by_word'].pop(word_id, []):
+            data['words_by_term'].get(term, {}).pop(word_id, None)
+        return True
+
+    def apply_save(self, data, word):
+        self.apply_delete(data, word.pk)
+        self._add_word(data, word.pk, word.english_word, [(raw, normalized) for _, raw, normalized in word.get_meanings()])
+        return True
+
+    def suggest(self, normalized_query, max_distance, limit):
+        """
+        Return up to `limit` suggestions [(distance, term, {word_id: (english_word, raw)})], closest first.
+        """
+        with self._lock:
+            data = self.get()
+            suggestions = []
+            for distance, term in data['terms'].search(normalized_query, max_distance):
+                words = data['words_by_term'].get(term)
+                if words:
+                    suggestions.append((distance, term, dict(words)))
+                    if len(suggestions) == limit:
+                        break
+            return suggestions
+
+
+meaning_index = MeaningIndex(ttl=_fuzzy_settings.get('INDEX_TTL', 3600))
@@ -0,0 +1,64 @@
+import threading
+import time
+
+
+class WordIndex:
+    """
+    Base class for process-local lookup structures derived from the EnglishWord table.
+
+    The structure is built on first use by build() and rebuilt when it is older than
+    `ttl` seconds (to pick up writes made by other processes) or after mark_stale().
+    Subclasses can override apply_save()/apply_delete() to update a built structure in
+    place instead of rebuilding it. Every instance is registered in WordIndex.instances
+    so signal handlers and bulk commands can reach all of them.
+    """
+    instances = []
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._data = None
+        self._built_at = 0.0
+        self._lock = threading.RLock()
+        WordIndex.instances.append(self)
+
+    def build(self):
+        raise NotImplementedError
+
+    def apply_save(self, data, word):
+        """Update `data` in place for a saved word. Return False to force a rebuild instead."""
+        return False
+
+    def apply_delete(self, data, word_id):
+        """Update `data` in place for a deleted word. Return False to force a rebuild instead."""
+        return False
+
+    def _is_fresh(self):
+        return self._data is not None and (self.ttl is None or time.monotonic() - self._built_at < self.ttl)
+
+    def get(self):
+        if self._is_fresh():
+            return self._data
+        with self._lock:
+            if not self._is_fresh():
+                self._data = self.build()
+                self._built_at = time.monotonic()
+            return self._data
+
+    def mark_stale(self):
+        with self._lock:
+            self._data = None
+
+    def word_saved(self, word):
+        with self._lock:
+            if self._data is not None and not self.apply_save(self._data, word):
+                self._data = None
+
+    def word_deleted(self, word_id):
+        with self._lock:
+            if self._data is not None and not self.apply_delete(self._data, word_id):
+                self._data = None
+
+
+def mark_all_indexes_stale():
+    for index in WordIndex.instances:
+        index.mark_stale()
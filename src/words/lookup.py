@@ -0,0 +1,161 @@
+import bisect
+from django.conf import settings
+from .indexes import WordIndex
+from .models import EnglishWord, iter_word_meanings
+
+PHRASE = 'phrase'
+TOKEN = 'token'
+# Seconds before an index is rebuilt from the database (to pick up writes from other processes)
+INDEX_TTL = getattr(settings, 'WORDS_REVERSE_INDEX_TTL', 3600)
+
+
+def tokenize(normalized):
+    """
+    Split a normalized meaning ("con-meo") into its tokens (["con", "meo"]).
+    """
+    return [token for token in normalized.split('-') if token]
+
+
+class ReverseIndex(WordIndex):
+    """
+    Inverted index from normalized Vietnamese meanings to English words.
+
+    - phrases: normalized meaning -> {word_id: position of that meaning}
+    - tokens: token -> {(word_id, position)}, one entry per meaning containing the token
+    - words: word_id -> (english_word, raw meanings), enough to answer without the database
+    Saves and deletes update it in place.
+    """
+
+    def build(self):
+        data = {'phrases': {}, 'tokens': {}, 'words': {}}
+        for word_id, english_word, meanings in iter_word_meanings():
+            self._add_word(data, word_id, english_word, meanings)
+        return data
+
+    def _add_word(self, data, word_id, english_word, meanings):
+        meanings = [(raw, phrase) for raw, phrase in meanings if phrase]
+        for position, (_, phrase) in enumerate(meanings):
+            data['phrases'].setdefault(phrase, {})[word_id] = position
+            for token in set(tokenize(phrase)):
+                data['tokens'].setdefault(token, set()).add((word_id, position))
+        data['words'][word_id] = (english_word, meanings)
+
+    def apply_delete(self, data, word_id):
+        _, meanings = data['words'].pop(word_id, (None, []))
+        for position, (_, phrase) in enumerate(meanings):
+            data['phrases'].get(phrase, {}).pop(word_id, None)
+            for token in set(tokenize(phrase)):
+                data['tokens'].get(token, set()).discard((word_id, position))
+        return True
+
+    def apply_save(self, data, word):
+        self.apply_delete(data, word.pk)
+        self._add_word(data, word.pk, word.english_word, [(raw, normalized) for _, raw, normalized in word.get_meanings()])
+        return True
+
+    def lookup(self, normalized_query, match=PHRASE, limit=20):
+        """
+        Return up to `limit` matches [(word_id, english_word, all raw meanings, matched raw meanings)].
+
+        PHRASE matches words that have exactly this (normalized) meaning. TOKEN matches words
+        with a meaning containing every token of the query; meanings with fewer extra tokens
+        rank first.
+        """
+        with self._lock:
+            data = self.get()
+            if match == PHRASE:
+                hits = {(word_id, position): 0 for word_id, position in data['phrases'].get(normalized_query, {}).items()}
+            else:
+                query_tokens = set(tokenize(normalized_query))
+                postings = sorted((data['tokens'].get(token, set()) for token in query_tokens), key=len)
+                matched = set(postings[0]).intersection(*postings[1:]) if postings else set()
+                hits = {}
+                for word_id, position in matched:
+                    phrase = data['words'][word_id][1][position][1]
+                    hits[(word_id, position)] = len(set(tokenize(phrase))) - len(query_tokens)
+
+            best = {}
+            for (word_id, position), extra_tokens in hits.items():
+                best.setdefault(word_id, []).append((extra_tokens, position))
+            ranked = sorted(best.items(), key=lambda item: (min(item[1])[0], item[0]))[:limit]
+
+            results = []
+            for word_id, positions in ranked:
+                english_word, meanings = data['words'][word_id]
+                results.append((
+                    word_id,
+                    english_word,
+                    [raw for raw, _ in meanings],
+                    [meanings[position][0] for _, position in sorted(positions)],
+                ))
+            return results
+
+
+reverse_index = ReverseIndex(ttl=INDEX_TTL)
+
+
+class SortedPrefixList:
+    """
+    English words kept sorted by their lowercase form, so all words starting with a
+    prefix form one contiguous run found with bisect in O(log n).
+    """
+
+    def __init__(self, entries=()):
+        # entries: (english_word, word_id)
+        self._items = sorted((english_word.lower(), english_word, word_id) for english_word, word_id in entries)
+
+    def __len__(self):
+        return len(self._items)
+
+    def add(self, english_word, word_id):
+        bisect.insort(self._items, (english_word.lower(), english_word, word_id))
+
+    def remove(self, english_word, word_id):
+        item = (english_word.lower(), english_word, word_id)
+        position = bisect.bisect_left(self._items, item)
+        if position < len(self._items) and self._items[position] == item:
+            del self._items[position]
+
+    def search(self, prefix, limit):
+        """
+        Return up to `limit` (english_word, word_id) pairs starting with `prefix`, case-insensitively, in order.
+        """
+        prefix = prefix.lower()
+        position = bisect.bisect_left(self._items, (prefix,))
+        results = []
+        for lowered, english_word, word_id in self._items[position:position + limit]:
+            if not lowered.startswith(prefix):
+                break
+            results.append((english_word, word_id))
+        return results
+
+
+class PrefixIndex(WordIndex):
+    """
+    SortedPrefixList of all English words, updated in place on saves and deletes.
+    """
+
+    def build(self):
+        return {
+            'words': SortedPrefixList(EnglishWord.objects.values_list('english_word', 'pk').iterator(chunk_size=5000)),
+            'by_id': dict(EnglishWord.objects.values_list('pk', 'english_word').iterator(chunk_size=5000)),
+        }
+
+    def apply_delete(self, data, word_id):
+        english_word = data['by_id'].pop(word_id, None)
+        if english_word is not None:
+            data['words'].remove(english_word, word_id)
+        return True
+
+    def apply_save(self, data, word):
+        self.apply_delete(data, word.pk)
+        data['by_id'][word.pk] = word.english_word
+        data['words'].add(word.english_word, word.pk)
+        return True
+
+    def autocomplete(self, prefix, limit=10):
+        with self._lock:
+            return self.get()['words'].search(prefix, limit)
+
+
+prefix_index = PrefixIndex(ttl=INDEX_TTL)
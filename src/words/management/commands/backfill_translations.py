@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from words.models import EnglishWord, replace_translations
+from words.cache import clear_word_caches
+
+class Command(BaseCommand):
+    help = ('Creates or repairs the Translation rows of all EnglishWord objects from their vietnamese_translation_* '
+            'fields (data migration for the Translation table; also fixes rows after raw queryset updates).')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of words read and written per batch (default: 1000).',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        scanned_count = 0
+        updated_count = 0
+        batch = []
+
+        def flush():
+            with transaction.atomic():
+                replace_translations(batch)
+            batch.clear()
+
+        words = EnglishWord.objects.order_by('pk').with_translations()
+        for word in words.iterator(chunk_size=batch_size):
+            scanned_count += 1
+            stored = [(t.position, t.text, t.normalized) for t in word.translations.all()]
+            if word.get_meanings() != stored:
+                batch.append(word)
+                updated_count += 1
+            if len(batch) >= batch_size:
+                flush()
+                self.stdout.write(f"Scanned {scanned_count} words, updated {updated_count}...")
+        if batch:
+            flush()
+        clear_word_caches()
+
+        self.stdout.write(self.style.SUCCESS(f"Finished backfilling translations. Scanned: {scanned_count}. Updated: {updated_count}."))
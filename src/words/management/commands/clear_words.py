@@ -1,5 +1,9 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
 from words.models import EnglishWord
+from words.cache import clear_word_caches
+from words.catalog import deferred_catalog_bumps
 
 class Command(BaseCommand):
     help = 'Deletes all EnglishWord objects from the database.'
@@ -10,13 +14,61 @@ class Command(BaseCommand):
             action='store_true',
             help='Deletes all words without prompting for confirmation.',
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Width of the primary key range deleted per transaction (default: 5000).',
+        )
+        parser.add_argument(
+            '--truncate',
+            action='store_true',
+            help="Empties the table with the database's TRUNCATE (or equivalent) instead of deleting in batches.",
+        )
 
     def handle(self, *args, **options):
+        if options['batch_size'] <= 0:
+            raise CommandError('--batch-size must be a positive integer.')
+
         if not options['no_input']:
             confirm = input("Are you sure you want to delete ALL words from the database? This action cannot be undone. (yes/N): ")
             if confirm.lower() != 'yes':
                 self.stdout.write(self.style.WARNING("Operation cancelled by user."))
                 return
 
-        count, _ = EnglishWord.objects.all().delete()
-        self.stdout.write(self.style.SUCCESS(f"Successfully deleted {count} words from the database."))
\ No newline at end of file
+        if options['truncate']:
+            count = self.truncate()
+        else:
+            count = self.delete_in_batches(options['batch_size'])
+
+        # Truncation and bulk deletes leave process-local caches and indexes stale
+        clear_word_caches()
+        self.stdout.write(self.style.SUCCESS(f"Successfully deleted {count} words from the database."))
+
+    def delete_in_batches(self, batch_size):
+        pks = EnglishWord.objects.order_by('pk').values_list('pk', flat=True)
+        start = pks.first()
+        total = 0
+        while start is not None:
+            end = start + batch_size
+            # Each range is its own short transaction, so the table is never locked for long
+            # The catalog version is bumped once at the end (clear_word_caches), not per word
+            with transaction.atomic(), deferred_catalog_bumps():
+                _, counts = EnglishWord.objects.filter(pk__gte=start, pk__lt=end).delete()
+            # delete() also counts cascaded rows (Translation); report words only
+            total += counts.get(EnglishWord._meta.label, 0)
+            self.stdout.write(f"Deleted {total} words (up to id {end - 1})...")
+            # Jump over gaps in the id space instead of walking empty ranges
+            start = pks.filter(pk__gte=end).first()
+        return total
+
+    def truncate(self):
+        # Tables with a foreign key to EnglishWord are emptied in the same statement;
+        # anything else would leave dangling references or make TRUNCATE fail.
+        models = [EnglishWord] + [rel.related_model for rel in EnglishWord._meta.related_objects]
+        tables = [model._meta.db_table for model in models]
+        count = EnglishWord.objects.count()
+        sql_list = connection.ops.sql_flush(no_style(), tables, allow_cascade=False)
+        with transaction.atomic():
+            connection.ops.execute_sql_flush(sql_list)
+        return count
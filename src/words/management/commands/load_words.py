@@ -1,53 +1,204 @@
-from django.core.management.base import BaseCommand
-from words.models import EnglishWord # Ensure you import the correct model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, transaction
+from words.models import EnglishWord, TRANSLATION_FIELDS, replace_translations # Ensure you import the correct model
+from words.cache import invalidate_words
+from words.catalog import deferred_catalog_bumps
+from words.wordlist import iter_parsed_lines, skipped_line_message
 import os
 from django.conf import settings
 
 class Command(BaseCommand):
     help = 'Loads words from wordlist.txt into the EnglishWord model, handling multiple translations.'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--file',
+            type=str,
+            default='wordlist.txt',
+            help='Name of the wordlist file, relative to the project root directory (default: wordlist.txt).',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of lines looked up and written per batch (default: 1000).',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Parses the file and reports what would change without writing to the database.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of processes parsing the file in parallel. With more than 1, the file is '
+                 'memory-mapped and split into line-aligned chunks (default: 1, parse in-process).',
+        )
+        parser.add_argument(
+            '--sync',
+            action='store_true',
+            help='Incremental mode: compares content hashes with the database and only writes '
+                 'new or changed words, then reports the diff.',
+        )
+        parser.add_argument(
+            '--delete-missing',
+            action='store_true',
+            help='With --sync, also deletes words that are no longer in the file.',
+        )
+
     def handle(self, *args, **options):
         # Assume wordlist.txt is in the same directory as manage.py or in the project root
         # Adjust this path if your file is in a different location
-        file_path = os.path.join(settings.BASE_DIR, 'wordlist.txt')
+        file_path = os.path.join(settings.BASE_DIR, options['file'])
+        self.batch_size = options['batch_size']
+        self.dry_run = options['dry_run']
+        self.sync = options['sync']
+        self.verbosity = options['verbosity']
+        if options['delete_missing'] and not self.sync:
+            raise CommandError('--delete-missing can only be used together with --sync.')
 
         if not os.path.exists(file_path):
             self.stdout.write(self.style.ERROR(f'Wordlist file not found at {file_path}'))
             return
 
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line_number, line in enumerate(f, 1):
-                line = line.strip()
-                if not line or '__' not in line:
-                    self.stdout.write(self.style.WARNING(f'Skipping malformed line {line_number}: "{line}"'))
-                    continue
-
-                english_part, vietnamese_part = line.split('__', 1)
-                english_word_str = english_part.strip()
-                
-                # Split Vietnamese meanings by '--'
-                vietnamese_translations_list = [trans.strip() for trans in vietnamese_part.split('--') if trans.strip()]
-
-                if not english_word_str or not vietnamese_translations_list:
-                    self.stdout.write(self.style.WARNING(f'Skipping line {line_number} due to empty English word or translations: "{line}"'))
-                    continue
-
-                # Prepare data for the model, up to 5 meanings
-                word_data = {
-                    'vietnamese_translation_1': vietnamese_translations_list[0] if len(vietnamese_translations_list) > 0 else None,
-                    'vietnamese_translation_2': vietnamese_translations_list[1] if len(vietnamese_translations_list) > 1 else None,
-                    'vietnamese_translation_3': vietnamese_translations_list[2] if len(vietnamese_translations_list) > 2 else None,
-                    'vietnamese_translation_4': vietnamese_translations_list[3] if len(vietnamese_translations_list) > 3 else None,
-                    'vietnamese_translation_5': vietnamese_translations_list[4] if len(vietnamese_translations_list) > 4 else None,
-                }
-
-                try:
-                    obj, created = EnglishWord.objects.update_or_create(
-                        english_word=english_word_str,
-                        defaults=word_data
-                    )
-                    action = "Created" if created else "Updated"
-                    self.stdout.write(self.style.SUCCESS(f'{action} word: {english_word_str}'))
-                except Exception as e:
-                    self.stdout.write(self.style.ERROR(f'Error processing line {line_number} ({english_word_str}): {e}'))
-        self.stdout.write(self.style.SUCCESS('Finished loading words from wordlist.txt.'))
\ No newline at end of file
+        self.counts = {'created': 0, 'updated': 0, 'unchanged': 0, 'deleted': 0, 'skipped': 0}
+        self.updated_ids = []
+        # Dry run only: content hash of every word an earlier batch would have written
+        self.dry_run_hashes = {}
+        seen_words = set()
+
+        # Each batch commits on its own, so a long import holds no locks across batches
+        batch = {}
+        for parsed in iter_parsed_lines(file_path, workers=options['workers']):
+            if parsed.english_word is None:
+                self.stdout.write(self.style.WARNING(skipped_line_message(parsed.line_number, parsed.line, parsed.reason)))
+                self.counts['skipped'] += 1
+                continue
+
+            if parsed.english_word in batch and not self.sync:
+                # A repeated word overwrites the earlier line, like a second update_or_create would
+                self.counts['updated'] += 1
+            if options['delete_missing']:
+                seen_words.add(parsed.english_word)
+            batch[parsed.english_word] = parsed
+
+            if len(batch) >= self.batch_size:
+                self.write_batch(batch)
+                batch = {}
+                self.stdout.write(f"Processed {parsed.line_number} lines: {self.summary()}")
+        if batch:
+            self.write_batch(batch)
+        if options['delete_missing']:
+            self.delete_missing(seen_words)
+
+        # bulk_create()/bulk_update() do not send post_save, so refresh derived data explicitly
+        if not self.dry_run:
+            invalidate_words(self.updated_ids)
+
+        prefix = '[Dry run] ' if self.dry_run else ''
+        self.stdout.write(self.style.SUCCESS(f'{prefix}Finished loading words from {options["file"]}. {self.summary()}'))
+
+    def write_batch(self, batch):
+        existing_words = EnglishWord.objects.all()
+        if self.sync:
+            # Only the hash is needed to tell whether a row changed
+            existing_words = existing_words.only('pk', 'english_word', 'content_hash')
+        existing = existing_words.in_bulk(list(batch), field_name='english_word')
+        if self.dry_run:
+            # Nothing was written, so words from earlier batches must not look new (or unchanged) again
+            for english_word_str in batch.keys() & self.dry_run_hashes.keys():
+                word = existing.get(english_word_str) or EnglishWord(english_word=english_word_str)
+                word.content_hash = self.dry_run_hashes[english_word_str]
+                existing[english_word_str] = word
+        to_create = []
+        to_update = []
+        for english_word_str, parsed in batch.items():
+            word = existing.get(english_word_str)
+            if word is None:
+                word = EnglishWord(english_word=english_word_str)
+                to_create.append(word)
+            elif self.sync and word.content_hash == parsed.content_hash:
+                self.counts['unchanged'] += 1
+                continue
+            else:
+                to_update.append(word)
+            word.set_translations(parsed.translations, parsed.normalized)
+            word.content_hash = parsed.content_hash
+
+        if self.dry_run:
+            self.dry_run_hashes.update((word.english_word, word.content_hash) for word in to_create + to_update)
+        else:
+            try:
+                with transaction.atomic():
+                    self.save_words(to_create, to_update)
+            except DatabaseError:
+                # e.g. one over-length value on PostgreSQL; retry so only the rejected lines are lost
+                to_create, to_update = self.save_words_one_by_one(batch, to_create, to_update)
+            self.updated_ids.extend(word.pk for word in to_update)
+
+        self.counts['created'] += len(to_create)
+        self.counts['updated'] += len(to_update)
+        if self.sync and self.verbosity >= 2:
+            for word in to_create:
+                self.stdout.write(f"+ {word.english_word}")
+            for word in to_update:
+                self.stdout.write(f"~ {word.english_word}")
+
+    def save_words(self, to_create, to_update):
+        EnglishWord.objects.bulk_create(to_create, batch_size=self.batch_size)
+        EnglishWord.objects.bulk_update(to_update, TRANSLATION_FIELDS + ['content_hash'], batch_size=self.batch_size)
+        replace_translations(to_create + to_update)
+
+    def save_words_one_by_one(self, batch, to_create, to_update):
+        """
+        Write each word of a batch the database rejected in its own transaction, report the
+        lines that still fail as skipped, and return the (created, updated) words that were saved.
+        """
+        created = []
+        updated = []
+        for word in to_create:
+            # Primary keys assigned by the rolled-back insert do not exist
+            word.pk = None
+        for word in to_create + to_update:
+            is_new = word.pk is None
+            try:
+                with transaction.atomic():
+                    if is_new:
+                        self.save_words([word], [])
+                    else:
+                        self.save_words([], [word])
+            except DatabaseError as e:
+                if is_new:
+                    word.pk = None
+                parsed = batch[word.english_word]
+                self.stdout.write(self.style.WARNING(
+                    f'Skipping line {parsed.line_number} ("{word.english_word}") rejected by the database: {e}'
+                ))
+                self.counts['skipped'] += 1
+            else:
+                (created if is_new else updated).append(word)
+        return created, updated
+
+    def delete_missing(self, seen_words):
+        missing = []
+        for word_id, english_word_str in EnglishWord.objects.order_by('pk').values_list('pk', 'english_word').iterator(chunk_size=self.batch_size):
+            if english_word_str not in seen_words:
+                missing.append(word_id)
+                if self.verbosity >= 2:
+                    self.stdout.write(f"- {english_word_str}")
+
+        self.counts['deleted'] = len(missing)
+        if self.dry_run:
+            return
+        # The catalog version is bumped once at the end (invalidate_words), not per word
+        with deferred_catalog_bumps():
+            for start in range(0, len(missing), self.batch_size):
+                # delete() runs each batch in its own transaction
+                EnglishWord.objects.filter(pk__in=missing[start:start + self.batch_size]).delete()
+
+    def summary(self):
+        if self.sync:
+            return (f"Created: {self.counts['created']}. Updated: {self.counts['updated']}. "
+                    f"Unchanged: {self.counts['unchanged']}. Deleted: {self.counts['deleted']}. Skipped: {self.counts['skipped']}.")
+        return f"Created: {self.counts['created']}. Updated: {self.counts['updated']}. Skipped: {self.counts['skipped']}."
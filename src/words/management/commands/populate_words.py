@@ -1,18 +1,28 @@
 import os
 from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 # from english_words import get_english_words_set # No longer needed
-from words.models import EnglishWord
+from words.models import EnglishWord, replace_translations
+from words.wordlist import parse_line
+from words.indexes import mark_all_indexes_stale
+from words.catalog import bump_catalog_version
 from django.conf import settings
 
 class Command(BaseCommand):
-    help = 'Populates the database with English words from a text file and prompts for Vietnamese translations.'
+    help = 'Populates the database with new English words from a text file. Words that already exist are left untouched.'
 
     def add_arguments(self, parser):
         parser.add_argument(
             '--file',
             type=str,
             default='wordlist.txt', # Default file name
-            help='Name of the text file containing words (must be in the project root directory, e.g., src/). Each word should be on a new line.',
+            help='Name of the text file containing words (must be in the project root directory, e.g., src/). Each line should be "english__meaning1--meaning2".',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of words looked up and inserted per batch (default: 1000).',
         )
 
     def handle(self, *args, **options):
@@ -21,15 +31,18 @@ class Command(BaseCommand):
         # If your `manage.py` file is at `d:\Python\english-learning\src\`,
         # then settings.BASE_DIR will also be `d:\Python\english-learning\src\`
         file_path = os.path.join(settings.BASE_DIR, file_name)
+        self.batch_size = options['batch_size']
+        self.verbosity = options['verbosity']
 
-        words_from_file = []
         processed_lines = 0
-        added_count = 0
+        valid_entries = 0
+        self.added_count = 0
+        self.already_exists_count = 0
         skipped_malformed_count = 0
-        already_exists_count = 0
+        batch = {}
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            with open(file_path, 'r', encoding='utf-8') as f, transaction.atomic():
                 # Read each line and process
                 for line_number, line in enumerate(f, 1):
                     processed_lines += 1
@@ -37,39 +50,73 @@ class Command(BaseCommand):
                     if not line: # Skip empty line
                         continue
 
-                    parts = line.split('__', 1) # Split only at the first "__"
-                    if len(parts) == 2:
-                        english_word = parts[0].strip().lower()
-                        vietnamese_translation = parts[1].strip()
-                        if not english_word: # Skip if the English word is empty
-                            self.stdout.write(self.style.WARNING(f"Skipped line {line_number}: English word is empty in '{line}'."))
-                            skipped_malformed_count +=1
-                            continue
-                        words_from_file.append({'english': english_word, 'vietnamese': vietnamese_translation, 'line_number': line_number, 'original_line': line})
-                    else:
+                    english_word, result = parse_line(line)
+                    if english_word is None:
                         self.stdout.write(self.style.WARNING(f"Skipped line {line_number}: Malformed entry '{line}'. Expected format 'english__vietnamese'."))
-                        skipped_malformed_count +=1
+                        skipped_malformed_count += 1
+                        continue
+
+                    valid_entries += 1
+                    english_word = english_word.lower()
+                    if english_word in batch:
+                        # A later line with the same word finds the earlier one already added
+                        self.already_exists_count += 1
+                        continue
+                    batch[english_word] = result
+
+                    if len(batch) >= self.batch_size:
+                        self.add_batch(batch)
+                        batch = {}
+                if batch:
+                    self.add_batch(batch)
         except FileNotFoundError:
             raise CommandError(f"File '{file_path}' not found. Please make sure it exists.")
-        except Exception as e:
+        except (OSError, UnicodeDecodeError) as e:
             raise CommandError(f"Error reading file '{file_path}': {e}")
 
-        if not words_from_file:
+        # bulk_create() does not send post_save, so refresh derived indexes explicitly
+        if self.added_count:
+            mark_all_indexes_stale()
+            bump_catalog_version()
+
+        if not valid_entries:
             self.stdout.write(self.style.WARNING(f"No words found in '{file_path}' or the file is empty."))
             return
 
-        self.stdout.write(self.style.SUCCESS(f"Processed {processed_lines} lines from '{file_name}'. Found {len(words_from_file)} valid entries to attempt to add."))
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed_lines} lines from '{file_name}'. Found {valid_entries} valid entries to attempt to add."))
+        self.stdout.write(self.style.SUCCESS(f"Finished populating words. Added: {self.added_count}. Already existed: {self.already_exists_count}. Skipped (malformed): {skipped_malformed_count}."))
 
-        for item in words_from_file:
-            english_word = item['english']
-            vietnamese_translation = item['vietnamese']
-            
-            if not EnglishWord.objects.filter(english_word=english_word).exists():
-                EnglishWord.objects.create(english_word=english_word, vietnamese_translation=vietnamese_translation)
-                self.stdout.write(self.style.SUCCESS(f"Added: '{english_word}' - '{vietnamese_translation}'"))
-                added_count += 1
-            else:
-                self.stdout.write(self.style.NOTICE(f"Word '{english_word}' already exists in the database. Skipped from line {item['line_number']}: '{item['original_line']}'."))
-                already_exists_count += 1
+    def add_batch(self, batch):
+        existing = set(EnglishWord.objects.filter(english_word__in=list(batch)).values_list('english_word', flat=True))
+        new_words = []
+        for english_word, translations in batch.items():
+            if english_word in existing:
+                if self.verbosity >= 2:
+                    self.stdout.write(self.style.NOTICE(f"Word '{english_word}' already exists in the database. Skipped."))
+                continue
+            word = EnglishWord(english_word=english_word)
+            word.set_translations(translations)
+            word.fill_content_hash()
+            new_words.append(word)
+            if self.verbosity >= 2:
+                self.stdout.write(self.style.SUCCESS(f"Added: '{english_word}' - '{'--'.join(translations)}'"))
 
-        self.stdout.write(self.style.SUCCESS(f"Finished populating words. Added: {added_count}. Already existed: {already_exists_count}. Skipped (malformed): {skipped_malformed_count}."))
\ No newline at end of file
+        # ignore_conflicts covers words inserted concurrently since the lookup above
+        EnglishWord.objects.bulk_create(new_words, batch_size=self.batch_size, ignore_conflicts=True)
+        # ignore_conflicts leaves the pks unset, and a word inserted concurrently by someone else
+        # must keep its own meanings: only rows with this file's content hash are ours
+        saved = {
+            english_word: (pk, content_hash)
+            for english_word, pk, content_hash in EnglishWord.objects.filter(
+                english_word__in=[word.english_word for word in new_words]
+            ).values_list('english_word', 'pk', 'content_hash')
+        }
+        inserted = []
+        for word in new_words:
+            pk, content_hash = saved.get(word.english_word, (None, None))
+            if pk is not None and content_hash == word.content_hash:
+                word.pk = pk
+                inserted.append(word)
+        replace_translations(inserted)
+        self.added_count += len(inserted)
+        self.already_exists_count += len(existing) + len(new_words) - len(inserted)
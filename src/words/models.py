@@ -1,24 +1,207 @@
-from django.db import models
+from django.db import models, transaction
+from .utils import normalize_text_for_comparison, compute_content_hash, TRANSLATION_FIELDS
+
+class EnglishWordQuerySet(models.QuerySet):
+    def with_meaning(self, text):
+        """
+        Words that have `text` as one of their meanings, compared in normalized form.
+        A single equality lookup on the indexed Translation.normalized column.
+        """
+        normalized = normalize_text_for_comparison(text.strip())
+        if not normalized:
+            return self.none()
+        return self.filter(translations__normalized=normalized).distinct()
+
+    def with_translations(self):
+        """
+        Prefetch all meanings, so get_all_translations() and friends do not query per word.
+        """
+        return self.prefetch_related('translations')
+
 
 class EnglishWord(models.Model):
     english_word = models.CharField(max_length=100, unique=True, verbose_name="English")
+    # First five meanings, mirrored from the Translation rows at positions 1-5 for the flat API fields
     vietnamese_translation_1 = models.CharField(max_length=255, verbose_name="Vietnamese Meaning 1")
     vietnamese_translation_2 = models.CharField(max_length=255, verbose_name="Vietnamese Meaning 2", blank=True, null=True)
     vietnamese_translation_3 = models.CharField(max_length=255, verbose_name="Vietnamese Meaning 3", blank=True, null=True)
     vietnamese_translation_4 = models.CharField(max_length=255, verbose_name="Vietnamese Meaning 4", blank=True, null=True)
     vietnamese_translation_5 = models.CharField(max_length=255, verbose_name="Vietnamese Meaning 5", blank=True, null=True)
+    # Fingerprint of english_word + meanings, used by load_words --sync to skip unchanged rows
+    content_hash = models.CharField(max_length=32, blank=True, default='', editable=False)
+
+    objects = EnglishWordQuerySet.as_manager()
+
+    # Meanings set by set_translations() or written by save(), as (position, raw, normalized) tuples
+    _meanings = None
 
     def __str__(self):
         return self.english_word
 
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._meanings = None
+
+    def set_translations(self, translations, normalized=None):
+        """
+        Replace all meanings (any number of them; empty ones are dropped). The first five are
+        mirrored into vietnamese_translation_1..5. Saved by save() or replace_translations().
+        `normalized` can pass already computed normalized forms, in the same order.
+        """
+        if normalized is None:
+            normalized = [None] * len(translations)
+        pairs = [(raw, normalized_raw) for raw, normalized_raw in zip(translations, normalized) if raw]
+        for i, field in enumerate(TRANSLATION_FIELDS):
+            setattr(self, field, pairs[i][0] if i < len(pairs) else None)
+        self._meanings = [(position, raw, normalized_raw) for position, (raw, normalized_raw) in enumerate(pairs, 1)]
+
+    def get_meanings(self):
+        """
+        All meanings as (position, raw, normalized), by position.
+
+        Positions 1-5 come from the vietnamese_translation_* fields, so direct edits of those
+        fields win; later positions come from set_translations() or the Translation rows (no
+        query if prefetched with with_translations()). Words whose rows have not been
+        backfilled yet only have their flat fields.
+        """
+        if self._meanings is not None:
+            stored = self._meanings
+        elif self.pk is not None:
+            stored = [(t.position, t.text, t.normalized) for t in self.translations.all()]
+        else:
+            stored = []
+        stored_normalized = {(position, raw): normalized for position, raw, normalized in stored}
+
+        meanings = []
+        for position, field in enumerate(TRANSLATION_FIELDS, 1):
+            raw = getattr(self, field)
+            if raw:
+                meanings.append((position, raw, stored_normalized.get((position, raw))))
+        meanings.extend(meaning for meaning in stored if meaning[0] > len(TRANSLATION_FIELDS))
+        return [
+            (position, raw, normalized or normalize_text_for_comparison(raw.strip()))
+            for position, raw, normalized in meanings
+        ]
+
     def get_all_translations(self):
-        translations = [self.vietnamese_translation_1]
-        for i in range(2, 6):
-            translation = getattr(self, f'vietnamese_translation_{i}')
-            if translation:
-                translations.append(translation)
-        return translations
+        return [raw for _, raw, _ in self.get_meanings()]
+
+    def fill_content_hash(self):
+        """
+        Recompute content_hash from english_word and all meanings (does not save).
+        """
+        extra = [raw for position, raw, _ in self.get_meanings() if position > len(TRANSLATION_FIELDS)]
+        self.content_hash = compute_content_hash(self.english_word, [getattr(self, field) for field in TRANSLATION_FIELDS] + extra)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        sync = update_fields is None or bool(set(update_fields) & set(TRANSLATION_FIELDS + ['english_word']))
+        if sync:
+            # Resolve the meanings before saving so post_save receivers see the new ones
+            self._meanings = self.get_meanings()
+            self.fill_content_hash()
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'content_hash'}
+        # The word row and its Translation rows are written together or not at all
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+            if sync:
+                replace_translations([self])
 
     class Meta:
         verbose_name = "English Word"
-        verbose_name_plural = "English Words"
\ No newline at end of file
+        verbose_name_plural = "English Words"
+
+
+class Translation(models.Model):
+    """
+    One meaning of a word. Positions 1-5 are mirrored in EnglishWord.vietnamese_translation_1..5;
+    there is no upper limit.
+    """
+    word = models.ForeignKey(EnglishWord, on_delete=models.CASCADE, related_name='translations')
+    position = models.PositiveSmallIntegerField()
+    text = models.CharField(max_length=255, verbose_name="Vietnamese Meaning")
+    # Normalized form of text, used for grading and lookups by meaning
+    normalized = models.CharField(max_length=255, db_index=True)
+
+    def __str__(self):
+        return self.text
+
+    class Meta:
+        ordering = ['position']
+        constraints = [
+            models.UniqueConstraint(fields=['word', 'position'], name='unique_translation_position'),
+        ]
+
+
+def replace_translations(words):
+    """
+    Rewrite the Translation rows of saved words from their get_meanings(): one DELETE and one
+    bulk INSERT for all of them. For bulk_create()/bulk_update() callers, which bypass save().
+    Words without a pk (bulk_create() on backends that do not return ids, or ignore_conflicts)
+    are looked up by english_word first.
+    """
+    words = list(words)
+    missing = [word for word in words if word.pk is None]
+    if missing:
+        saved = EnglishWord.objects.in_bulk([word.english_word for word in missing], field_name='english_word')
+        for word in missing:
+            word.pk = saved[word.english_word].pk
+
+    rows = []
+    for word in words:
+        word._meanings = word.get_meanings()
+        rows.extend(
+            Translation(word_id=word.pk, position=position, text=raw, normalized=normalized)
+            for position, raw, normalized in word._meanings
+        )
+    Translation.objects.filter(word_id__in=[word.pk for word in words]).delete()
+    Translation.objects.bulk_create(rows)
+
+
+def extra_translations_by_word(word_ids):
+    """
+    Meanings after the fifth of the given words, by position: {word_id: [raw, ...]}. One query.
+    Together with the flat fields this gives get_all_translations() for rows read with values().
+    """
+    extras = {}
+    rows = (
+        Translation.objects.filter(word_id__in=word_ids, position__gt=len(TRANSLATION_FIELDS))
+        .order_by('word_id', 'position').values_list('word_id', 'text')
+    )
+    for word_id, text in rows:
+        extras.setdefault(word_id, []).append(text)
+    return extras
+
+
+def iter_word_meanings(chunk_size=2000):
+    """
+    Yield (word_id, english_word, [(raw, normalized), ...]) for every word that has Translation
+    rows, streaming the rows in word order. Used to build the in-memory indexes.
+    """
+    rows = (
+        Translation.objects.order_by('word_id', 'position')
+        .values_list('word_id', 'word__english_word', 'text', 'normalized')
+        .iterator(chunk_size=chunk_size)
+    )
+    current = None
+    for word_id, english_word, raw, normalized in rows:
+        if current is None or current[0] != word_id:
+            if current is not None:
+                yield current
+            current = (word_id, english_word, [])
+        current[2].append((raw, normalized))
+    if current is not None:
+        yield current
+
+
+class WordCatalogVersion(models.Model):
+    """
+    Single row counting changes to the EnglishWord table, used for ETag/Last-Modified on
+    the words API. Bumped by the model signals and by bulk commands (see words/catalog.py).
+    """
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Word Catalog Version"
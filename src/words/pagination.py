@@ -0,0 +1,16 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+_pagination_settings = getattr(settings, 'WORDS_API_PAGINATION', {})
+
+
+class EnglishWordCursorPagination(CursorPagination):
+    """
+    Keyset pagination over words, newest first. The cursor encodes the last id seen, so
+    every page is an indexed "id < X ORDER BY id DESC LIMIT n" query regardless of depth,
+    and rows inserted while a client pages through do not shift later pages.
+    """
+    ordering = '-id'
+    page_size = _pagination_settings.get('PAGE_SIZE', 100)
+    page_size_query_param = 'page_size'
+    max_page_size = _pagination_settings.get('MAX_PAGE_SIZE', 1000)
@@ -0,0 +1,167 @@
+import random
+from django.db.models import Max, Min
+from .models import EnglishWord
+from .utils import normalize_text_for_comparison
+
+# Number of random primary-key probes before falling back to a range scan.
+MAX_PK_PROBES = 8
+# Candidate ids drawn per distractor in each sampling round.
+DISTRACTOR_OVERSAMPLE = 4
+DISTRACTOR_ROUNDS = 3
+# Upper bound on rows read by the sparse-table fallback.
+DISTRACTOR_SCAN_LIMIT = 200
+# Candidate ids drawn per missing word in each sample_words round.
+SAMPLE_OVERSAMPLE = 2
+SAMPLE_ROUNDS = 3
+
+
+def get_pk_bounds(queryset):
+    """
+    Return (min_pk, max_pk) of the queryset, or (None, None) if it is empty.
+    Both aggregates are answered from the primary key index.
+    """
+    bounds = queryset.order_by().aggregate(low=Min('pk'), high=Max('pk'))
+    return bounds['low'], bounds['high']
+
+
+def get_random_word(queryset=None, rng=random):
+    """
+    Pick a random word without loading the whole table.
+
+    Random ids are drawn from the [min_pk, max_pk] range and looked up one by one,
+    so every existing word has the same chance of being chosen even when ids have
+    gaps (e.g. after clear_words and a reload). If the id space is too sparse for
+    the probes to hit, the word at a random offset in pk order is returned (a count
+    and an offset scan, still uniform). Returns None if there are no words.
+    """
+    if queryset is None:
+        queryset = EnglishWord.objects.all()
+    queryset = queryset.order_by()
+
+    low, high = get_pk_bounds(queryset)
+    if low is None:
+        return None
+
+    for _ in range(MAX_PK_PROBES):
+        word = queryset.filter(pk=rng.randint(low, high)).first()
+        if word is not None:
+            return word
+
+    count = queryset.count()
+    return queryset.order_by('pk')[rng.randrange(count)] if count else None
+
+
+def sample_words(n, queryset=None, rng=random):
+    """
+    Return up to n distinct random words using a bounded number of queries.
+
+    Each round looks up a batch of random ids with one `pk__in` query. If the id space is
+    too sparse to fill the sample, the rest is taken from consecutive ids after a random
+    pivot. Fewer than n words are returned only if the queryset holds fewer than n.
+    """
+    if queryset is None:
+        queryset = EnglishWord.objects.all()
+    queryset = queryset.order_by()
+
+    low, high = get_pk_bounds(queryset)
+    if low is None or n <= 0:
+        return []
+
+    picked = {}
+    for _ in range(SAMPLE_ROUNDS):
+        needed = n - len(picked)
+        candidate_pks = {rng.randint(low, high) for _ in range(needed * SAMPLE_OVERSAMPLE)} - picked.keys()
+        found = list(queryset.filter(pk__in=candidate_pks).order_by('pk'))
+        rng.shuffle(found)
+        for word in found[:needed]:
+            picked[word.pk] = word
+        if len(picked) == n:
+            break
+    else:
+        pivot = rng.randint(low, high)
+        for window in (queryset.filter(pk__gte=pivot), queryset.filter(pk__lt=pivot)):
+            needed = n - len(picked)
+            if not needed:
+                break
+            for word in window.exclude(pk__in=list(picked)).order_by('pk')[:needed]:
+                picked[word.pk] = word
+
+    words = list(picked.values())
+    rng.shuffle(words)
+    return words
+
+
+def _primary_meaning(word):
+    """
+    Normalized form of the answer distractors must differ from, without loading all meanings.
+    """
+    return normalize_text_for_comparison((word.vietnamese_translation_1 or '').strip())
+
+
+def pick_distractors(word, pool, k=2, rng=random):
+    """
+    Pick k distinct wrong answers for `word` from an already fetched pool of words.
+    Same rejection rules as sample_distractors, but without touching the database.
+    """
+    seen = {_primary_meaning(word)}
+    distractors = []
+    for candidate in rng.sample(pool, len(pool)):
+        translation = candidate.vietnamese_translation_1
+        if candidate.pk == word.pk or not translation:
+            continue
+        normalized = _primary_meaning(candidate)
+        if normalized in seen:
+            continue
+        seen.add(normalized)
+        distractors.append(translation)
+        if len(distractors) == k:
+            break
+    return distractors
+
+
+def sample_distractors(word, k=2, queryset=None, rng=random):
+    """
+    Return up to k distinct wrong answers (vietnamese_translation_1 of other words) for `word`.
+
+    Candidates are fetched with a few bounded `pk__in` queries over random ids. A candidate
+    is rejected if its normalized translation equals the correct answer or another distractor
+    already picked. Fewer than k values are returned only if the table cannot supply them.
+    """
+    if queryset is None:
+        queryset = EnglishWord.objects.all()
+    queryset = queryset.order_by().exclude(pk=word.pk)
+
+    low, high = get_pk_bounds(queryset)
+    if low is None or k <= 0:
+        return []
+
+    seen = {_primary_meaning(word)}
+    distractors = []
+
+    def take(rows):
+        for translation in rows:
+            if not translation:
+                continue
+            normalized = normalize_text_for_comparison(translation.strip())
+            if normalized in seen:
+                continue
+            seen.add(normalized)
+            distractors.append(translation)
+            if len(distractors) == k:
+                return True
+        return False
+
+    for _ in range(DISTRACTOR_ROUNDS):
+        candidate_pks = {rng.randint(low, high) for _ in range(k * DISTRACTOR_OVERSAMPLE)}
+        rows = list(queryset.filter(pk__in=candidate_pks).order_by('pk').values_list('vietnamese_translation_1', flat=True))
+        rng.shuffle(rows)
+        if take(rows):
+            return distractors
+
+    # Sparse id space: scan a bounded window after a random pivot, wrapping around once.
+    pivot = rng.randint(low, high)
+    for window in (queryset.filter(pk__gte=pivot), queryset.filter(pk__lt=pivot)):
+        rows = window.order_by('pk').values_list('vietnamese_translation_1', flat=True)[:DISTRACTOR_SCAN_LIMIT]
+        if take(rows):
+            break
+    return distractors
@@ -1,7 +1,14 @@
 from rest_framework import serializers
-from .models import EnglishWord
+from .models import EnglishWord, extra_translations_by_word
+from .utils import TRANSLATION_FIELDS
 
 class EnglishWordSerializer(serializers.ModelSerializer):
+    # All meanings, with no limit of five. When written it replaces every meaning, and the
+    # vietnamese_translation_* fields become its first five items.
+    translations = serializers.ListField(
+        child=serializers.CharField(max_length=255), required=False, allow_empty=False, write_only=True
+    )
+
     class Meta:
         model = EnglishWord
         fields = [
@@ -11,5 +18,88 @@ class EnglishWordSerializer(serializers.ModelSerializer):
             'vietnamese_translation_2', 
             'vietnamese_translation_3', 
             'vietnamese_translation_4', 
-            'vietnamese_translation_5'
-        ]
\ No newline at end of file
+            'vietnamese_translation_5',
+            'translations'
+        ]
+        extra_kwargs = {'vietnamese_translation_1': {'required': False}}
+
+    def validate(self, attrs):
+        if not self.partial and not attrs.get('vietnamese_translation_1') and not attrs.get('translations'):
+            raise serializers.ValidationError({'vietnamese_translation_1': "This field is required."})
+        return attrs
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data['translations'] = instance.get_all_translations()
+        return data
+
+    def create(self, validated_data):
+        translations = self.pop_translations(validated_data)
+        word = EnglishWord(**validated_data)
+        if translations is not None:
+            word.set_translations(translations)
+        word.save()
+        return word
+
+    def update(self, instance, validated_data):
+        translations = self.pop_translations(validated_data)
+        if translations is not None:
+            instance.set_translations(translations)
+        return super().update(instance, validated_data)
+
+    def pop_translations(self, validated_data):
+        """
+        Take 'translations' out of validated_data; when given, it overrides the flat fields.
+        """
+        translations = validated_data.pop('translations', None)
+        if translations is not None:
+            for field in TRANSLATION_FIELDS:
+                validated_data.pop(field, None)
+        return translations
+
+
+class BulkWordItemSerializer(serializers.Serializer):
+    """
+    One item of a bulk write: an upsert (full replacement of the meanings) or a delete,
+    keyed by english_word. Validation only; words/bulk.py applies the items.
+    """
+    UPSERT = 'upsert'
+    DELETE = 'delete'
+
+    op = serializers.ChoiceField(choices=[UPSERT, DELETE], default=UPSERT)
+    english_word = serializers.CharField(max_length=100)
+    vietnamese_translation_1 = serializers.CharField(max_length=255, required=False)
+    vietnamese_translation_2 = serializers.CharField(max_length=255, required=False, allow_blank=True, allow_null=True)
+    vietnamese_translation_3 = serializers.CharField(max_length=255, required=False, allow_blank=True, allow_null=True)
+    vietnamese_translation_4 = serializers.CharField(max_length=255, required=False, allow_blank=True, allow_null=True)
+    vietnamese_translation_5 = serializers.CharField(max_length=255, required=False, allow_blank=True, allow_null=True)
+    # All meanings, overriding the flat fields (see EnglishWordSerializer.translations)
+    translations = serializers.ListField(child=serializers.CharField(max_length=255), required=False, allow_empty=False)
+
+    def validate(self, attrs):
+        if attrs['op'] == self.UPSERT and not attrs.get('vietnamese_translation_1') and not attrs.get('translations'):
+            raise serializers.ValidationError({'vietnamese_translation_1': "This field is required."})
+        return attrs
+
+
+# Fields of the read endpoints, in the order EnglishWordSerializer outputs them
+WORD_FIELDS = EnglishWordSerializer.Meta.fields
+# Their database columns; 'translations' is built from the flat fields plus Translation rows
+WORD_COLUMNS = [field for field in WORD_FIELDS if field != 'translations']
+
+
+def word_dicts(rows, fields=WORD_FIELDS):
+    """
+    Build EnglishWordSerializer's output from .values(*WORD_COLUMNS) rows, for read-only endpoints.
+    The columns are plain int/str/None values, so the serializer's per-field to_representation()
+    is the identity; 'translations' (the flat fields plus any meanings after the fifth, as in
+    EnglishWord.get_all_translations()) costs one query for the whole batch.
+    """
+    rows = list(rows)
+    if 'translations' in fields:
+        extras = extra_translations_by_word([row['id'] for row in rows])
+        for row in rows:
+            row['translations'] = [row[field] for field in TRANSLATION_FIELDS if row[field]] + extras.get(row['id'], [])
+    if fields == WORD_FIELDS:
+        return rows
+    return [{name: row[name] for name in fields} for row in rows]
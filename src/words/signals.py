@@ -0,0 +1,35 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .cache import answer_key_cache
+from .catalog import bump_catalog_version, catalog_bumps_deferred
+from .indexes import WordIndex
+from .models import EnglishWord
+from . import fuzzy, lookup  # noqa: F401  (registers the in-memory indexes)
+
+# Cached data and indexes change only once the write commits: earlier, a concurrent cache miss
+# could reload and re-cache the old row, and a rollback would leave them describing writes
+# the database never kept.
+
+def _apply_save(index, word, word_id):
+    # A later delete in the same transaction clears the pk; its own callback removes the word
+    if word.pk == word_id:
+        index.word_saved(word)
+
+@receiver(post_save, sender=EnglishWord)
+def word_saved(sender, instance, **kwargs):
+    word_id = instance.pk
+    transaction.on_commit(lambda: answer_key_cache.invalidate(word_id))
+    for index in WordIndex.instances:
+        transaction.on_commit(lambda index=index: _apply_save(index, instance, word_id))
+    if not catalog_bumps_deferred():
+        bump_catalog_version()
+
+@receiver(post_delete, sender=EnglishWord)
+def word_deleted(sender, instance, **kwargs):
+    word_id = instance.pk
+    transaction.on_commit(lambda: answer_key_cache.invalidate(word_id))
+    for index in WordIndex.instances:
+        transaction.on_commit(lambda index=index: index.word_deleted(word_id))
+    if not catalog_bumps_deferred():
+        bump_catalog_version()
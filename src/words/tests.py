@@ -1,13 +1,47 @@
 from django.test import TestCase, Client
 from django.urls import reverse
-from .models import EnglishWord
+from .models import EnglishWord, Translation
 from .forms import TranslationForm
 from .viewsets import normalize_text_for_comparison, remove_vietnamese_diacritics
+from .utils import normalize_many, _normalize_cached, _normalize_for_comparison
+from .sampling import get_random_word, sample_distractors
+import random
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.core.management import call_command
+from io import StringIO
+import os
+import tempfile
+import timeit
+import csv
+import gzip
+import io
+import json
+import unicodedata
+from unittest import mock, skipUnless
+from collections import Counter
+from django.conf import settings
+from unidecode import unidecode
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from .cache import AnswerKeyCache, answer_key_cache, clear_word_caches
+from .fuzzy import SegmentIndex, levenshtein
+from .lookup import SortedPrefixList
+from .serializers import EnglishWordSerializer, WORD_COLUMNS, WORD_FIELDS, word_dicts
+from rest_framework.renderers import JSONRenderer
 from django.contrib.messages import get_messages
 
 # Create your tests here.
 
 class HelperFunctionTests(TestCase):
+    def test_long_input_is_not_cached(self):
+        _normalize_cached.cache_clear()
+        long_text = "Xin chào " * 1000
+        self.assertEqual(normalize_text_for_comparison(long_text), '-'.join(["xin-chao"] * 1000))
+        self.assertEqual(_normalize_cached.cache_info().currsize, 0)
+        normalize_text_for_comparison("Xin chào")
+        self.assertEqual(_normalize_cached.cache_info().currsize, 1)
+
     def test_remove_vietnamese_diacritics(self):
         self.assertEqual(remove_vietnamese_diacritics("Tiếng Việt"), "Tieng Viet")
         self.assertEqual(remove_vietnamese_diacritics("Chào bạn"), "Chao ban")
@@ -19,11 +53,49 @@ class HelperFunctionTests(TestCase):
         self.assertEqual(normalize_text_for_comparison("ĐỒNG BẰNG"), "dong-bang")
         self.assertEqual(normalize_text_for_comparison("Một-Hai Ba"), "mot-hai-ba")
 
+    def test_normalize_decomposed_input(self):
+        self.assertEqual(normalize_text_for_comparison(unicodedata.normalize('NFD', "Tiếng Việt")), "tieng-viet")
+        self.assertEqual(remove_vietnamese_diacritics(unicodedata.normalize('NFD', "Đồng")), "Dong")
+
+    def test_normalize_many(self):
+        texts = ["Tiếng Việt", "  Chào   bạn  ", "ĐỒNG BẰNG", "", "naïve"]
+        self.assertEqual(normalize_many(texts), [normalize_text_for_comparison(t) for t in texts])
+        self.assertEqual(normalize_many([]), [])
+
+
+def legacy_normalize(text):
+    # The unidecode-based normalizer the translate table replaced
+    return unidecode(text.lower()).replace(" ", "-")
+
+
+class NormalizerVocabularyTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        from .wordlist import iter_parsed_lines
+        path = os.path.join(settings.BASE_DIR, 'wordlist.txt')
+        cls.translations = [t for p in iter_parsed_lines(path) if p.english_word for t in p.translations]
+
+    def test_matches_legacy_normalizer_on_vocabulary(self):
+        for text in self.translations:
+            self.assertEqual(normalize_text_for_comparison(text), legacy_normalize(text), text)
+        self.assertEqual(normalize_many(self.translations), [legacy_normalize(t) for t in self.translations])
+
+    @skipUnless(os.environ.get('RUN_BENCHMARKS'), "timing benchmark; set RUN_BENCHMARKS=1 to run it")
+    def test_benchmark_against_unidecode(self):
+        uncached = _normalize_for_comparison
+        legacy_time = min(timeit.repeat(lambda: [legacy_normalize(t) for t in self.translations], number=3, repeat=3))
+        table_time = min(timeit.repeat(lambda: [uncached(t) for t in self.translations], number=3, repeat=3))
+        batch_time = min(timeit.repeat(lambda: normalize_many(self.translations), number=3, repeat=3))
+        self.assertLess(table_time, legacy_time)
+        self.assertLess(batch_time, legacy_time)
+
 
 class RandomWordQuizViewTests(TestCase):
     def setUp(self):
         self.client = Client()
         self.url = reverse('words:random_word_quiz')
+        answer_key_cache.clear() # ids are reused between tests once rows are rolled back
         self.word1 = EnglishWord.objects.create(
             english_word="Hello", 
             vietnamese_translation_1="Xin chào",
@@ -149,3 +221,897 @@ class RandomWordQuizViewTests(TestCase):
         self.assertTrue(response.context['form'].errors)
         self.assertEqual(response.context['word'], self.word1)
         self.assertEqual(self.client.session['current_word_id'], self.word1.id) # current_word_id should still be in session
+
+
+class RandomWordSamplerTests(TestCase):
+    def setUp(self):
+        self.words = [
+            EnglishWord.objects.create(english_word=f"word{i}", vietnamese_translation_1=f"từ {i}")
+            for i in range(10)
+        ]
+
+    def test_returns_none_when_no_words(self):
+        EnglishWord.objects.all().delete()
+        self.assertIsNone(get_random_word())
+
+    def test_handles_id_gaps(self):
+        # Keep only the first and last word so the id range is mostly holes
+        EnglishWord.objects.filter(pk__in=[w.pk for w in self.words[1:-1]]).delete()
+        rng = random.Random(0)
+        picked = {get_random_word(rng=rng).pk for _ in range(50)}
+        self.assertEqual(picked, {self.words[0].pk, self.words[-1].pk})
+
+    def test_sparse_fallback_is_uniform(self):
+        # Words right after a large id gap must not be favoured once the probes give up
+        EnglishWord.objects.filter(pk__in=[w.pk for w in self.words[2:-1]]).delete()
+        rng = random.Random(3)
+        with mock.patch('words.sampling.MAX_PK_PROBES', 0):
+            picks = Counter(get_random_word(rng=rng).pk for _ in range(300))
+        self.assertEqual(set(picks), {self.words[0].pk, self.words[1].pk, self.words[-1].pk})
+        self.assertTrue(all(60 <= n <= 140 for n in picks.values()), picks)
+
+    def test_every_word_reachable(self):
+        rng = random.Random(1)
+        picked = {get_random_word(rng=rng).pk for _ in range(200)}
+        self.assertEqual(picked, {w.pk for w in self.words})
+
+    def test_does_not_load_whole_table(self):
+        with self.assertNumQueries(2): # bounds aggregate + one pk lookup
+            get_random_word(rng=random.Random(2))
+
+    def test_medium_quiz_choices_endpoint(self):
+        response = self.client.get(reverse('word-medium-quiz-choices'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(response.json()['id'], {w.pk for w in self.words})
+
+
+class DistractorSamplerTests(TestCase):
+    def setUp(self):
+        self.target = EnglishWord.objects.create(english_word="hello", vietnamese_translation_1="Xin chào")
+        self.others = [
+            EnglishWord.objects.create(english_word=f"other{i}", vietnamese_translation_1=f"nghĩa {i}")
+            for i in range(6)
+        ]
+
+    def test_returns_k_distinct_wrong_answers(self):
+        distractors = sample_distractors(self.target, k=3, rng=random.Random(0))
+        self.assertEqual(len(distractors), 3)
+        self.assertEqual(len(set(distractors)), 3)
+        self.assertNotIn("Xin chào", distractors)
+
+    def test_rejects_translations_equal_to_correct_answer(self):
+        EnglishWord.objects.create(english_word="hi", vietnamese_translation_1="xin chao")
+        EnglishWord.objects.create(english_word="greetings", vietnamese_translation_1="XIN CHÀO")
+        for seed in range(20):
+            distractors = sample_distractors(self.target, k=6, rng=random.Random(seed))
+            normalized = {normalize_text_for_comparison(d) for d in distractors}
+            self.assertNotIn(normalize_text_for_comparison("Xin chào"), normalized)
+
+    def test_returns_fewer_when_table_too_small(self):
+        EnglishWord.objects.filter(pk__in=[w.pk for w in self.others[1:]]).delete()
+        self.assertEqual(sample_distractors(self.target, k=2), ["nghĩa 0"])
+
+    def test_easy_quiz_choices_endpoint(self):
+        response = self.client.get(reverse('word-easy-quiz-choices'))
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(len(data['other_random_translations']), 2)
+        self.assertNotIn(data['correct_translation'], data['other_random_translations'])
+
+
+class QuizRoundTests(TestCase):
+    def setUp(self):
+        self.url = reverse('word-quiz-round')
+        for i in range(30):
+            EnglishWord.objects.create(english_word=f"word{i}", vietnamese_translation_1=f"nghĩa {i}")
+
+    def test_easy_round(self):
+        response = self.client.get(self.url, {'count': 10})
+        self.assertEqual(response.status_code, 200)
+        questions = response.json()['questions']
+        self.assertEqual(len(questions), 10)
+        self.assertEqual(len({q['id'] for q in questions}), 10)
+        for q in questions:
+            self.assertEqual(len(q['other_random_translations']), 2)
+            self.assertNotIn(q['correct_translation'], q['other_random_translations'])
+
+    def test_medium_round(self):
+        response = self.client.get(self.url, {'mode': 'medium', 'count': 5})
+        self.assertEqual(response.status_code, 200)
+        questions = response.json()['questions']
+        self.assertEqual(len({q['id'] for q in questions}), 5)
+        self.assertIn('vietnamese_translation_1', questions[0])
+
+    def test_seed_is_reproducible(self):
+        first = self.client.get(self.url, {'count': 8, 'seed': 42}).json()
+        second = self.client.get(self.url, {'count': 8, 'seed': 42}).json()
+        self.assertEqual(first, second)
+
+    def test_round_larger_than_table(self):
+        response = self.client.get(self.url, {'mode': 'medium', 'count': 50})
+        self.assertEqual(len(response.json()['questions']), 30)
+
+    def test_query_count_is_bounded(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.url, {'count': 50, 'seed': 1})
+        self.assertLessEqual(len(ctx.captured_queries), 6) # bounds + 3 sampling rounds + 2 fallback windows
+
+    def test_medium_round_prefetches_translations(self):
+        # Ids are dense, so one sampling round fills the round: bounds + sampling + translations
+        with self.assertNumQueries(3):
+            questions = self.client.get(self.url, {'mode': 'medium', 'count': 20, 'seed': 1}).json()['questions']
+        self.assertEqual(len(questions), 20)
+        self.assertTrue(all(q['translations'] == [q['vietnamese_translation_1']] for q in questions))
+
+    def test_invalid_params(self):
+        self.assertEqual(self.client.get(self.url, {'mode': 'hard'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'count': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'count': 51}).status_code, 400)
+
+
+class CheckRoundTests(TestCase):
+    def setUp(self):
+        self.url = reverse('word-check-round')
+        answer_key_cache.clear()
+        self.hello = EnglishWord.objects.create(
+            english_word="Hello", vietnamese_translation_1="Xin chào", vietnamese_translation_2="Chào bạn"
+        )
+        self.goodbye = EnglishWord.objects.create(english_word="Goodbye", vietnamese_translation_1="Tạm biệt")
+
+    def post(self, data):
+        return self.client.post(self.url, data, content_type='application/json')
+
+    def test_grades_round_with_one_word_query(self):
+        answers = [
+            {'id': self.hello.id, 'translation': 'chào bạn'},
+            {'id': self.goodbye.id, 'translation': 'Sai rồi'},
+            {'id': 999, 'translation': 'gì đó'},
+        ]
+        with self.assertNumQueries(2): # words + their prefetched meanings
+            response = self.post({'answers': answers})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([r['is_correct'] for r in data['results']], [True, False, False])
+        self.assertEqual(data['results'][0]['correct_translations'], ["Xin chào", "Chào bạn"])
+        self.assertEqual(data['results'][2]['detail'], "Word not found.")
+        self.assertEqual((data['score'], data['total']), (1, 3))
+
+    def test_easy_mode_only_accepts_primary_meaning(self):
+        response = self.post({'mode': 'easy', 'answers': [
+            {'id': self.hello.id, 'translation': 'Chào bạn'},
+            {'id': self.goodbye.id, 'translation': 'TẠM BIỆT'},
+        ]})
+        self.assertEqual([r['is_correct'] for r in response.json()['results']], [False, True])
+
+    def test_invalid_payload(self):
+        self.assertEqual(self.post({'answers': []}).status_code, 400)
+        self.assertEqual(self.post({'answers': [{'translation': 'x'}]}).status_code, 400)
+        self.assertEqual(self.post({'mode': 'hard', 'answers': [{'id': 1}]}).status_code, 400)
+
+
+class NormalizedTranslationTests(TestCase):
+    def setUp(self):
+        self.word = EnglishWord.objects.create(
+            english_word="Hello", vietnamese_translation_1="Xin chào", vietnamese_translation_3=" Chào bạn "
+        )
+
+    def stored(self, word):
+        return list(word.translations.values_list('position', 'text', 'normalized'))
+
+    def test_save_stores_translation_rows(self):
+        self.assertEqual(self.stored(self.word), [(1, "Xin chào", "xin-chao"), (3, " Chào bạn ", "chao-ban")])
+        self.word.vietnamese_translation_1 = "Tạm biệt"
+        self.word.save(update_fields=['vietnamese_translation_1'])
+        self.assertEqual(self.stored(self.word)[0], (1, "Tạm biệt", "tam-biet"))
+
+    def test_more_than_five_meanings(self):
+        self.word.set_translations(["một", "hai", "ba", "bốn", "năm", "sáu", "bảy"])
+        self.word.save()
+        word = EnglishWord.objects.with_translations().get(pk=self.word.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(word.get_all_translations(), ["một", "hai", "ba", "bốn", "năm", "sáu", "bảy"])
+            self.assertEqual([normalized for _, _, normalized in word.get_meanings()][5:], ["sau", "bay"])
+        self.assertEqual((word.vietnamese_translation_5, word.vietnamese_translation_3), ("năm", "ba"))
+
+        # Editing a flat field keeps the meanings after the fifth
+        word.vietnamese_translation_2 = "HAI"
+        word.save()
+        word.refresh_from_db()
+        self.assertEqual(word.get_all_translations(), ["một", "HAI", "ba", "bốn", "năm", "sáu", "bảy"])
+
+    def test_save_is_atomic_with_translation_rows(self):
+        self.word.vietnamese_translation_1 = "Tạm biệt"
+        with mock.patch('words.models.replace_translations', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.word.save()
+        self.word.refresh_from_db()
+        self.assertEqual(self.word.vietnamese_translation_1, "Xin chào")
+        self.assertEqual(self.stored(self.word)[0][1], "Xin chào")
+
+    def test_with_meaning_lookup(self):
+        EnglishWord.objects.create(english_word="Hi", vietnamese_translation_1="CHÀO BẠN")
+        self.word.set_translations(["a", "b", "c", "d", "e", "Chào bạn"])
+        self.word.save()
+        with CaptureQueriesContext(connection) as queries:
+            matches = sorted(EnglishWord.objects.with_meaning("chào bạn").values_list('english_word', flat=True))
+        self.assertEqual(matches, ["Hello", "Hi"])
+        self.assertEqual(len(queries.captured_queries), 1)
+        self.assertIn('"normalized" = ', queries.captured_queries[0]['sql'])
+        self.assertFalse(EnglishWord.objects.with_meaning("").exists())
+
+    def test_backfill_command(self):
+        legacy = EnglishWord.objects.bulk_create([EnglishWord(english_word="Legacy", vietnamese_translation_1="Cũ")])[0]
+        self.assertEqual(self.stored(legacy), [])
+        self.assertEqual(legacy.get_all_translations(), ["Cũ"]) # falls back to the flat fields
+        out = StringIO()
+        call_command('backfill_translations', stdout=out)
+        self.assertEqual(self.stored(legacy), [(1, "Cũ", "cu")])
+        self.assertIn("Scanned: 2. Updated: 1.", out.getvalue())
+
+
+class TranslationApiTests(TestCase):
+    def setUp(self):
+        clear_word_caches()
+        self.api = APIClient()
+
+    def test_translations_field_is_uncapped_and_flat_fields_stay(self):
+        meanings = ["một", "hai", "ba", "bốn", "năm", "sáu"]
+        response = self.api.post(reverse('word-list'), {'english_word': "six", 'translations': meanings}, format='json')
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual(data['translations'], meanings)
+        self.assertEqual((data['vietnamese_translation_1'], data['vietnamese_translation_5']), ("một", "năm"))
+        detail_url = reverse('word-detail', args=[data['id']])
+        self.assertEqual(self.api.get(detail_url).json(), data)
+
+        # Flat-field clients keep working and do not lose the sixth meaning
+        response = self.api.patch(detail_url, {'vietnamese_translation_1': "MỘT"}, format='json')
+        self.assertEqual(response.json()['translations'], ["MỘT"] + meanings[1:])
+        check = self.api.post(reverse('word-check-translation', args=[data['id']]), {'translation': 'sau'}, format='json')
+        self.assertTrue(check.json()['is_correct'])
+        self.assertEqual(self.api.post(reverse('word-list'), {'english_word': "none"}, format='json').status_code, 400)
+
+    def test_importers_keep_every_meaning(self):
+        handle, path = tempfile.mkstemp(suffix='.txt')
+        with os.fdopen(handle, 'w', encoding='utf-8') as f:
+            f.write("many__1--2--3--4--5--6--7\n")
+        self.addCleanup(os.remove, path)
+        call_command('load_words', '--file', path, stdout=StringIO())
+        many = EnglishWord.objects.get(english_word="many")
+        self.assertEqual(many.get_all_translations(), ["1", "2", "3", "4", "5", "6", "7"])
+        self.assertIn("Unchanged: 1.", self.load_sync(path))
+        export = b''.join(self.api.get(reverse('word-export')).streaming_content).decode('utf-8')
+        self.assertEqual(export, "many__1--2--3--4--5--6--7\n")
+        self.assertEqual(self.api.get(reverse('word-reverse-lookup'), {'q': '7'}).json()['results'][0]['id'], many.pk)
+
+    def load_sync(self, path):
+        out = StringIO()
+        call_command('load_words', '--file', path, '--sync', stdout=out)
+        return out.getvalue()
+
+
+class AnswerKeyCacheTests(TestCase):
+    def setUp(self):
+        answer_key_cache.clear()
+        self.word = EnglishWord.objects.create(
+            english_word="Hello", vietnamese_translation_1="Xin chào", vietnamese_translation_2="Chào bạn"
+        )
+        self.url = reverse('word-check-translation', args=[self.word.pk])
+
+    def test_lru_eviction_and_ttl(self):
+        cache = AnswerKeyCache(maxsize=2, ttl=60)
+        cache.set(1, 'a')
+        cache.set(2, 'b')
+        cache.get(1)
+        cache.set(3, 'c') # evicts 2, the least recently used
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(cache.get(1), 'a')
+        expired = AnswerKeyCache(ttl=-1)
+        expired.set(1, 'a')
+        self.assertIsNone(expired.get(1))
+
+    def test_check_translation_uses_cache(self):
+        self.client.post(self.url, {'translation': 'xin chào'})
+        with self.assertNumQueries(0):
+            response = self.client.post(self.url, {'translation': 'chào bạn'})
+        self.assertTrue(response.json()['is_correct'])
+        self.assertGreaterEqual(answer_key_cache.stats()['hits'], 1)
+
+    def test_save_and_delete_invalidate(self):
+        self.client.post(self.url, {'translation': 'xin chào'})
+        self.word.vietnamese_translation_2 = "Chào anh"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.word.save()
+        response = self.client.post(self.url, {'translation': 'chào anh'})
+        self.assertTrue(response.json()['is_correct'])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.word.delete()
+        self.assertEqual(self.client.post(self.url, {'translation': 'chào anh'}).status_code, 404)
+
+    def test_invalidation_waits_for_commit(self):
+        self.client.post(self.url, {'translation': 'xin chào'})
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.word.vietnamese_translation_2 = "Chào anh"
+            self.word.save()
+            # Not committed yet: the cached answer key is still served
+            self.assertEqual(answer_key_cache.stats()['size'], 1)
+        self.assertTrue(callbacks)
+        try:
+            with transaction.atomic():
+                self.word.delete()
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        # Rolled back: nothing to invalidate
+        self.assertEqual(answer_key_cache.stats()['size'], 1)
+
+    def test_clear_words_clears_cache(self):
+        self.client.post(self.url, {'translation': 'xin chào'})
+        call_command('clear_words', no_input=True, stdout=StringIO())
+        self.assertEqual(answer_key_cache.stats()['size'], 0)
+
+    def test_stats_endpoint_requires_admin(self):
+        stats_url = reverse('word-answer-key-cache-stats')
+        self.assertIn(self.client.get(stats_url).status_code, (401, 403))
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'secret-pass-123')
+        client = APIClient()
+        client.force_authenticate(admin)
+        response = client.get(stats_url)
+        self.assertEqual(set(response.json()), {'hits', 'misses', 'size', 'maxsize', 'ttl'})
+
+
+class LoadWordsCommandTests(TestCase):
+    def setUp(self):
+        EnglishWord.objects.create(english_word="hello", vietnamese_translation_1="chào")
+        handle, self.path = tempfile.mkstemp(suffix='.txt')
+        with os.fdopen(handle, 'w', encoding='utf-8') as f:
+            f.write("hello__xin chào--chào bạn\n")
+            f.write("goodbye__tạm biệt\n")
+            f.write("not a word line\n")
+            f.write("__no english\n")
+            f.write("cat__con mèo\n")
+            f.write("cat__mèo--con mèo\n")
+            f.write("many__1--2--3--4--5--6\n")
+        self.addCleanup(os.remove, self.path)
+
+    def load(self, *args):
+        out = StringIO()
+        call_command('load_words', '--file', self.path, *args, stdout=out)
+        return out.getvalue()
+
+    def test_bulk_load(self):
+        output = self.load('--batch-size', '2')
+        self.assertIn("Created: 3. Updated: 2. Skipped: 2.", output)
+        self.assertIn('Skipping malformed line 3: "not a word line"', output)
+        hello = EnglishWord.objects.get(english_word="hello")
+        self.assertEqual(hello.get_all_translations(), ["xin chào", "chào bạn"])
+        self.assertEqual([normalized for _, _, normalized in hello.get_meanings()], ["xin-chao", "chao-ban"])
+        self.assertEqual(EnglishWord.objects.get(english_word="cat").vietnamese_translation_1, "mèo")
+        self.assertEqual(EnglishWord.objects.get(english_word="many").vietnamese_translation_5, "5")
+
+    def test_parallel_parse_matches_sequential(self):
+        from .wordlist import iter_parsed_lines
+        sequential = list(iter_parsed_lines(self.path))
+        self.assertEqual(list(iter_parsed_lines(self.path, workers=2, chunk_bytes=16)), sequential)
+        output = self.load('--workers', '2')
+        self.assertIn("Created: 3. Updated: 2. Skipped: 2.", output)
+        self.assertIn('Skipping line 4 due to empty English word or translations: "__no english"', output)
+
+    def test_sync_only_writes_changes(self):
+        self.load()
+        EnglishWord.objects.create(english_word="removed", vietnamese_translation_1="bị xóa")
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write("dog__con chó\n")
+            f.write("goodbye__tạm biệt--chào tạm biệt\n")
+        output = self.load('--sync', '--delete-missing', '-v', '2')
+        self.assertIn("Created: 1. Updated: 1. Unchanged: 3. Deleted: 1. Skipped: 2.", output)
+        self.assertIn("+ dog", output)
+        self.assertIn("~ goodbye", output)
+        self.assertIn("- removed", output)
+        self.assertFalse(EnglishWord.objects.filter(english_word="removed").exists())
+        self.assertEqual(EnglishWord.objects.get(english_word="goodbye").vietnamese_translation_2, "chào tạm biệt")
+        self.assertIn("Created: 0. Updated: 0. Unchanged: 5.", self.load('--sync'))
+
+    def test_content_hash_kept_in_sync_on_save(self):
+        self.load()
+        word = EnglishWord.objects.get(english_word="goodbye")
+        word.vietnamese_translation_1 = "chào"
+        word.save()
+        self.assertIn("Updated: 1. Unchanged: 3.", self.load('--sync'))
+
+    def test_populate_words_adds_only_new_words(self):
+        out = StringIO()
+        with CaptureQueriesContext(connection) as ctx:
+            call_command('populate_words', '--file', self.path, stdout=out)
+        self.assertIn("Added: 3. Already existed: 2. Skipped (malformed): 2.", out.getvalue())
+        # lookup + insert, pk lookup + delete/insert of the Translation rows, plus savepoint and catalog version bump
+        self.assertLessEqual(len(ctx.captured_queries), 8)
+        self.assertEqual(EnglishWord.objects.get(english_word="hello").vietnamese_translation_1, "chào")
+        cat = EnglishWord.objects.get(english_word="cat")
+        self.assertEqual((cat.vietnamese_translation_1, [normalized for _, _, normalized in cat.get_meanings()]), ("con mèo", ["con-meo"]))
+
+    def test_populate_words_leaves_concurrently_inserted_words_alone(self):
+        bulk_create = EnglishWord.objects.bulk_create
+
+        def insert_cat_first(words, **kwargs):
+            # Another process adds "cat" between the lookup and the insert
+            EnglishWord.objects.create(english_word="cat", vietnamese_translation_1="mèo")
+            return bulk_create(words, **kwargs)
+
+        out = StringIO()
+        with mock.patch.object(EnglishWord.objects, 'bulk_create', side_effect=insert_cat_first):
+            call_command('populate_words', '--file', self.path, stdout=out)
+        self.assertIn("Added: 2. Already existed: 3.", out.getvalue())
+        cat = EnglishWord.objects.get(english_word="cat")
+        self.assertEqual(list(cat.translations.values_list('text', flat=True)), ["mèo"])
+
+    def test_dry_run_writes_nothing(self):
+        output = self.load('--dry-run')
+        self.assertIn("[Dry run]", output)
+        self.assertIn("Created: 3. Updated: 2. Skipped: 2.", output)
+        self.assertEqual(EnglishWord.objects.count(), 1)
+        self.assertEqual(EnglishWord.objects.get().vietnamese_translation_1, "chào")
+
+    def test_dry_run_counts_match_real_run_across_batches(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("a__x\nb__y\na__z\n")
+        for args in [('--sync',), ()]:
+            dry_run = self.load('--batch-size', '2', '--dry-run', *args).splitlines()[-1]
+            real_run = self.load('--batch-size', '2', *args).splitlines()[-1]
+            self.assertEqual(dry_run, "[Dry run] " + real_run)
+            EnglishWord.objects.filter(english_word__in=["a", "b"]).delete()
+        self.assertIn("Created: 2. Updated: 1. Skipped: 0.", real_run)
+
+    def test_rejected_line_is_skipped_and_the_import_continues(self):
+        from django.db import DataError
+        from .management.commands import load_words
+
+        def reject_cat(words):
+            if any(word.english_word == "cat" for word in words):
+                raise DataError("value too long for type character varying(255)")
+            return real_replace_translations(words)
+
+        real_replace_translations = load_words.replace_translations
+        with mock.patch.object(load_words, 'replace_translations', side_effect=reject_cat):
+            output = self.load('--batch-size', '2')
+        self.assertIn("Created: 2. Updated: 2. Skipped: 3.", output)
+        self.assertIn('Skipping line 6 ("cat") rejected by the database: value too long', output)
+        self.assertFalse(EnglishWord.objects.filter(english_word="cat").exists())
+        self.assertEqual(EnglishWord.objects.get(english_word="many").vietnamese_translation_5, "5")
+        self.assertEqual(EnglishWord.objects.get(english_word="hello").get_all_translations(), ["xin chào", "chào bạn"])
+
+
+class ClearWordsCommandTests(TestCase):
+    def setUp(self):
+        EnglishWord.objects.bulk_create(
+            [EnglishWord(english_word=f"word{i}", vietnamese_translation_1=f"nghĩa {i}") for i in range(25)]
+        )
+        # Leave a gap in the id range
+        EnglishWord.objects.filter(english_word__in=["word10", "word11", "word12"]).delete()
+
+    def test_chunked_delete(self):
+        out = StringIO()
+        call_command('clear_words', no_input=True, batch_size=4, stdout=out)
+        self.assertFalse(EnglishWord.objects.exists())
+        self.assertIn("Successfully deleted 22 words", out.getvalue())
+        self.assertIn("Deleted 4 words", out.getvalue())
+
+    def test_chunked_delete_counts_words_not_translations(self):
+        EnglishWord.objects.all().delete()
+        for i in range(10):
+            EnglishWord.objects.create(english_word=f"saved{i}", vietnamese_translation_1="một", vietnamese_translation_2="hai")
+        self.assertEqual(Translation.objects.count(), 20)
+        out = StringIO()
+        call_command('clear_words', no_input=True, batch_size=4, stdout=out)
+        self.assertIn("Successfully deleted 10 words", out.getvalue())
+        self.assertIn("Deleted 4 words", out.getvalue())
+        self.assertFalse(Translation.objects.exists())
+
+    def test_truncate(self):
+        answer_key_cache.set(1, 'stale')
+        out = StringIO()
+        call_command('clear_words', no_input=True, truncate=True, stdout=out)
+        self.assertFalse(EnglishWord.objects.exists())
+        self.assertIn("Successfully deleted 22 words", out.getvalue())
+        self.assertIsNone(answer_key_cache.get(1))
+
+
+class FuzzyMatchTests(TestCase):
+    def setUp(self):
+        clear_word_caches()
+        self.hello = EnglishWord.objects.create(
+            english_word="Hello", vietnamese_translation_1="Xin chào", vietnamese_translation_2="Chào bạn"
+        )
+        self.school = EnglishWord.objects.create(english_word="School", vietnamese_translation_1="Trường học")
+        self.url = reverse('word-check-translation', args=[self.hello.pk])
+
+    def test_levenshtein(self):
+        self.assertEqual(levenshtein("kitten", "sitting"), 3)
+        self.assertEqual(levenshtein("", "abc"), 3)
+        self.assertEqual(levenshtein("xin-chao", "xin-chao"), 0)
+        self.assertEqual(levenshtein("truong-hoc", "truon-hoc"), 1)
+
+    def test_segment_index_matches_brute_force(self):
+        terms = ["xin-chao", "chao-ban", "truong-hoc", "hoc", "chao", "tam-biet", "a", "truong"]
+        index = SegmentIndex(max_distance=2)
+        for term in terms:
+            index.add(term)
+        for query in ["xin-chau", "chao-bn", "truong-ho", "hc", "b", "tam-bet", ""]:
+            for max_distance in (0, 1, 2):
+                expected = sorted((levenshtein(query, t), t) for t in terms if levenshtein(query, t) <= max_distance)
+                self.assertEqual(index.search(query, max_distance), expected, (query, max_distance))
+
+    def test_check_translation_is_strict_by_default(self):
+        response = self.client.post(self.url, {'translation': 'xin chau'})
+        self.assertFalse(response.json()['is_correct'])
+        self.assertNotIn('distance', response.json())
+
+    def test_check_translation_with_max_distance(self):
+        data = self.client.post(self.url, {'translation': 'xin chau', 'max_distance': 1}).json()
+        self.assertTrue(data['is_correct'])
+        self.assertEqual((data['matched_translation'], data['distance']), ("Xin chào", 1))
+        data = self.client.post(self.url, {'translation': 'xn chau', 'max_distance': 1}).json()
+        self.assertFalse(data['is_correct'])
+        self.assertEqual(self.client.post(self.url, {'translation': 'x', 'max_distance': 5}).status_code, 400)
+
+    def test_did_you_mean(self):
+        url = reverse('word-did-you-mean')
+        data = self.client.get(url, {'q': 'truong hok'}).json()
+        self.assertEqual(data['suggestions'][0]['translation'], "Trường học")
+        self.assertEqual(data['suggestions'][0]['words'], [{'id': self.school.pk, 'english_word': "School"}])
+        self.assertEqual(self.client.get(url).status_code, 400)
+
+    def test_did_you_mean_follows_writes(self):
+        url = reverse('word-did-you-mean')
+        self.client.get(url, {'q': 'con meo'}) # build the index
+        with self.captureOnCommitCallbacks(execute=True):
+            cat = EnglishWord.objects.create(english_word="Cat", vietnamese_translation_1="Con mèo")
+        self.assertEqual(self.client.get(url, {'q': 'con meo'}).json()['suggestions'][0]['words'][0]['id'], cat.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            cat.delete()
+        self.assertEqual(self.client.get(url, {'q': 'con meo'}).json()['suggestions'], [])
+
+
+class ReverseLookupTests(TestCase):
+    def setUp(self):
+        clear_word_caches()
+        self.url = reverse('word-reverse-lookup')
+        self.cat = EnglishWord.objects.create(english_word="Cat", vietnamese_translation_1="Con mèo")
+        self.kitten = EnglishWord.objects.create(
+            english_word="Kitten", vietnamese_translation_1="Mèo con", vietnamese_translation_2="Con mèo nhỏ"
+        )
+        self.dog = EnglishWord.objects.create(english_word="Dog", vietnamese_translation_1="Con chó")
+
+    def test_phrase_match(self):
+        data = self.client.get(self.url, {'q': 'CON MÈO'}).json()
+        self.assertEqual([r['english_word'] for r in data['results']], ["Cat"])
+        self.assertEqual(data['results'][0]['matched_translations'], ["Con mèo"])
+
+    def test_token_match_ranks_closest_meaning_first(self):
+        data = self.client.get(self.url, {'q': 'meo con', 'match': 'token'}).json()
+        self.assertEqual([r['english_word'] for r in data['results']], ["Cat", "Kitten"])
+        self.assertEqual(data['results'][1]['matched_translations'], ["Mèo con", "Con mèo nhỏ"])
+        self.assertEqual(self.client.get(self.url, {'q': 'chó', 'match': 'token'}).json()['results'][0]['id'], self.dog.pk)
+
+    def test_index_follows_writes(self):
+        self.client.get(self.url, {'q': 'con meo'}) # build the index
+        self.cat.vietnamese_translation_1 = "Mèo"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cat.save()
+        self.assertEqual(self.client.get(self.url, {'q': 'con meo'}).json()['results'], [])
+        self.assertEqual(self.client.get(self.url, {'q': 'meo'}).json()['results'][0]['id'], self.cat.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dog.delete()
+        self.assertEqual(self.client.get(self.url, {'q': 'chó', 'match': 'token'}).json()['results'], [])
+
+    def test_reverse_grading_reads_the_database(self):
+        check_url = reverse('word-check-reverse-translation')
+        self.client.get(self.url, {'q': 'con meo'}) # build the index
+        # Not applied to this process's index (as if written by another process)
+        EnglishWord.objects.create(english_word="Kitty", vietnamese_translation_1="Con mèo")
+        with self.assertNumQueries(2):
+            data = self.client.post(check_url, {'translation': 'Con Mèo', 'english_word': 'KITTY'}).json()
+        self.assertTrue(data['is_correct'])
+        self.assertEqual(data['correct_english_words'], ["Cat", "Kitty"])
+
+    def test_reverse_quiz(self):
+        questions = self.client.get(reverse('word-quiz-round'), {'mode': 'reverse', 'count': 3}).json()['questions']
+        self.assertEqual({q['vietnamese_translation'] for q in questions}, {"Con mèo", "Mèo con", "Con chó"})
+        check_url = reverse('word-check-reverse-translation')
+        data = self.client.post(check_url, {'translation': 'con meo', 'english_word': 'cat'}).json()
+        self.assertTrue(data['is_correct'])
+        self.assertFalse(self.client.post(check_url, {'translation': 'con chó', 'english_word': 'cat'}).json()['is_correct'])
+        self.assertEqual(self.client.post(check_url, {'translation': 'con vịt', 'english_word': 'duck'}).status_code, 404)
+
+    def test_invalid_params(self):
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'q': 'meo', 'match': 'fuzzy'}).status_code, 400)
+
+
+class AutocompleteTests(TestCase):
+    def setUp(self):
+        clear_word_caches()
+        self.url = reverse('word-autocomplete')
+        for english_word in ["Apple", "application", "Apply", "banana", "app"]:
+            EnglishWord.objects.create(english_word=english_word, vietnamese_translation_1="x")
+
+    def test_prefix_is_case_insensitive_and_sorted(self):
+        data = self.client.get(self.url, {'q': 'APP'}).json()
+        self.assertEqual([r['english_word'] for r in data['results']], ["app", "Apple", "application", "Apply"])
+        self.assertEqual([r['english_word'] for r in self.client.get(self.url, {'q': 'appl', 'limit': 2}).json()['results']], ["Apple", "application"])
+        self.assertEqual(self.client.get(self.url, {'q': 'cherry'}).json()['results'], [])
+
+    def test_index_follows_writes(self):
+        self.client.get(self.url, {'q': 'b'}) # build the index
+        banana = EnglishWord.objects.get(english_word="banana")
+        banana.english_word = "Blueberry"
+        with self.captureOnCommitCallbacks(execute=True):
+            banana.save()
+        self.assertEqual([r['english_word'] for r in self.client.get(self.url, {'q': 'b'}).json()['results']], ["Blueberry"])
+        with self.captureOnCommitCallbacks(execute=True):
+            banana.delete()
+        self.assertEqual(self.client.get(self.url, {'q': 'b'}).json()['results'], [])
+
+    def test_rolled_back_writes_leave_the_index_alone(self):
+        self.client.get(self.url, {'q': 'b'}) # build the index
+        try:
+            with transaction.atomic():
+                EnglishWord.objects.create(english_word="Blueberry", vietnamese_translation_1="x")
+                EnglishWord.objects.get(english_word="banana").delete()
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertEqual([r['english_word'] for r in self.client.get(self.url, {'q': 'b'}).json()['results']], ["banana"])
+
+    def test_invalid_params(self):
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'q': 'a', 'limit': 0}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'q': 'a', 'limit': 'x'}).status_code, 400)
+
+    @skipUnless(os.environ.get('RUN_BENCHMARKS'), "timing benchmark; set RUN_BENCHMARKS=1 to run it")
+    def test_benchmark_500k_words(self):
+        rng = random.Random(15)
+        letters = 'abcdefghijklmnopqrstuvwxyz'
+        words = [''.join(rng.choices(letters, k=rng.randint(3, 12))) for _ in range(500000)]
+        index = SortedPrefixList((word, i) for i, word in enumerate(words))
+        prefixes = [word[:rng.randint(1, 4)] for word in rng.sample(words, 200)]
+        per_query = min(timeit.repeat(lambda: [index.search(p, 10) for p in prefixes], number=1, repeat=3)) / len(prefixes)
+        self.assertLess(per_query, 0.005)
+        self.assertTrue(all(w.startswith('ab') for w, _ in index.search('AB', 10)))
+
+
+class WordListPaginationTests(TestCase):
+    def setUp(self):
+        self.url = reverse('word-list')
+        self.words = [EnglishWord.objects.create(english_word=f"word{i}", vietnamese_translation_1=f"từ {i}") for i in range(7)]
+
+    def test_cursor_pages_newest_first(self):
+        data = self.client.get(self.url, {'page_size': 3}).json()
+        self.assertEqual([r['id'] for r in data['results']], [w.pk for w in reversed(self.words[4:])])
+        self.assertIsNone(data['previous'])
+
+        # Words inserted while paging do not shift later pages
+        EnglishWord.objects.create(english_word="newcomer", vietnamese_translation_1="mới")
+        seen = [r['id'] for r in data['results']]
+        while data['next']:
+            data = self.client.get(data['next']).json()
+            seen.extend(r['id'] for r in data['results'])
+        self.assertEqual(seen, [w.pk for w in reversed(self.words)])
+
+    def test_deep_page_is_a_keyset_query(self):
+        data = self.client.get(self.url, {'page_size': 2}).json()
+        data = self.client.get(data['next']).json()
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(data['next'])
+        sql = next(q['sql'] for q in queries.captured_queries if 'FROM "words_englishword"' in q['sql'])
+        self.assertIn('"id" <', sql)
+        self.assertNotIn('OFFSET', sql)
+
+    def test_sparse_fieldsets(self):
+        data = self.client.get(self.url, {'fields': 'id,english_word', 'page_size': 1}).json()
+        self.assertEqual(data['results'], [{'id': self.words[-1].pk, 'english_word': "word6"}])
+        detail = self.client.get(reverse('word-detail', args=[self.words[0].pk]), {'fields': 'english_word'}).json()
+        self.assertEqual(detail, {'english_word': "word0"})
+        self.assertEqual(self.client.get(self.url, {'fields': 'id,password'}).status_code, 400)
+        self.assertEqual(len(self.client.get(self.url).json()['results'][0]), 8)
+
+
+class FastReadPathTests(TestCase):
+    def setUp(self):
+        EnglishWord.objects.create(english_word="Hello", vietnamese_translation_1="Xin chào", vietnamese_translation_2="Chào bạn")
+        EnglishWord.objects.create(english_word="Quote", vietnamese_translation_1='Trích "dẫn"', vietnamese_translation_3="")
+        EnglishWord.objects.create(english_word="Cat", vietnamese_translation_1="Con mèo")
+
+    def serializer_page(self, queryset):
+        return JSONRenderer().render(EnglishWordSerializer(queryset, many=True).data)
+
+    def test_list_and_detail_match_serializer_bytes(self):
+        data = self.client.get(reverse('word-list')).json()
+        self.assertEqual(JSONRenderer().render(data['results']), self.serializer_page(EnglishWord.objects.order_by('-id')))
+        for word in EnglishWord.objects.all():
+            content = self.client.get(reverse('word-detail', args=[word.pk]), HTTP_ACCEPT='application/json').content
+            self.assertEqual(content, JSONRenderer().render(EnglishWordSerializer(word).data))
+        self.assertEqual(self.client.get(reverse('word-detail', args=[999999])).status_code, 404)
+
+    def test_sparse_fields_keep_serializer_order(self):
+        data = self.client.get(reverse('word-list'), {'fields': 'english_word,id'}).json()
+        self.assertEqual(list(data['results'][0]), ['id', 'english_word'])
+
+    @skipUnless(os.environ.get('RUN_BENCHMARKS'), "timing benchmark; set RUN_BENCHMARKS=1 to run it")
+    def test_benchmark_against_serializer(self):
+        EnglishWord.objects.bulk_create(
+            EnglishWord(english_word=f"word{i}", vietnamese_translation_1=f"nghĩa {i}", vietnamese_translation_2="phụ")
+            for i in range(5000)
+        )
+        queryset = EnglishWord.objects.order_by('-id')
+        serializer_time = min(timeit.repeat(lambda: EnglishWordSerializer(list(queryset.with_translations()), many=True).data, number=1, repeat=3))
+        fast_time = min(timeit.repeat(lambda: word_dicts(queryset.values(*WORD_COLUMNS)), number=1, repeat=3))
+        self.assertEqual(word_dicts(queryset.values(*WORD_COLUMNS)), EnglishWordSerializer(queryset.with_translations(), many=True).data)
+        self.assertLess(fast_time, serializer_time)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.word = EnglishWord.objects.create(english_word="Hello", vietnamese_translation_1="Xin chào")
+        self.list_url = reverse('word-list')
+        self.detail_url = reverse('word-detail', args=[self.word.pk])
+
+    def test_if_none_match_returns_304_without_reading_rows(self):
+        for url in (self.list_url, self.detail_url):
+            first = self.client.get(url)
+            self.assertEqual(first.status_code, 200)
+            self.assertTrue(first['ETag'].startswith('"'))
+            self.assertIn('Last-Modified', first)
+            with CaptureQueriesContext(connection) as queries:
+                second = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+            self.assertEqual(second.status_code, 304)
+            self.assertEqual(second['ETag'], first['ETag'])
+            self.assertFalse(any('words_englishword' in q['sql'] for q in queries.captured_queries))
+
+    def test_if_modified_since_returns_304_without_reading_rows(self):
+        for url in (self.list_url, self.detail_url):
+            first = self.client.get(url)
+            with CaptureQueriesContext(connection) as queries:
+                second = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+            self.assertEqual(second.status_code, 304)
+            self.assertEqual(second['Last-Modified'], first['Last-Modified'])
+            self.assertFalse(any('words_englishword' in q['sql'] for q in queries.captured_queries))
+
+    def test_etag_differs_per_representation(self):
+        etags = {
+            self.client.get(self.list_url)['ETag'],
+            self.client.get(self.list_url, {'fields': 'id'})['ETag'],
+            self.client.get(self.detail_url)['ETag'],
+            self.client.get(self.list_url, HTTP_ACCEPT='text/html')['ETag'],
+        }
+        self.assertEqual(len(etags), 4)
+
+    def test_writes_change_the_etag(self):
+        etag = self.client.get(self.list_url)['ETag']
+
+        def assert_changed():
+            nonlocal etag
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            etag = response['ETag']
+
+        self.word.vietnamese_translation_2 = "Chào"
+        self.word.save()
+        assert_changed()
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        api = APIClient()
+        api.force_authenticate(admin)
+        api.post(self.list_url, {'english_word': "Cat", 'vietnamese_translation_1': "Con mèo"}, format='json')
+        assert_changed()
+        self.client.force_login(admin)
+        self.client.post(reverse('admin:words_englishword_delete', args=[self.word.pk]), {'post': 'yes'})
+        assert_changed()
+        handle, path = tempfile.mkstemp(suffix='.txt')
+        with os.fdopen(handle, 'w', encoding='utf-8') as f:
+            f.write("dog__con chó\n")
+        self.addCleanup(os.remove, path)
+        call_command('load_words', '--file', path, stdout=StringIO())
+        assert_changed()
+        call_command('clear_words', no_input=True, stdout=StringIO())
+        assert_changed()
+
+
+class BulkWriteTests(TestCase):
+    def setUp(self):
+        clear_word_caches()
+        self.url = reverse('word-bulk')
+        self.api = APIClient()
+        self.api.force_authenticate(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        self.hello = EnglishWord.objects.create(english_word="hello", vietnamese_translation_1="xin chào")
+        self.cat = EnglishWord.objects.create(english_word="cat", vietnamese_translation_1="con mèo")
+
+    def test_json_array_reports_status_per_item(self):
+        items = [
+            {'english_word': "dog", 'vietnamese_translation_1': "con chó", 'vietnamese_translation_2': "cún"},
+            {'english_word': "hello", 'vietnamese_translation_1': "chào"},
+            {'english_word': "cat", 'vietnamese_translation_1': "con mèo"},
+            {'op': 'delete', 'english_word': "missing"},
+            {'english_word': "bird"},
+            {'english_word': "dog", 'vietnamese_translation_1': "chó"},
+            "not an object",
+        ]
+        data = self.api.post(self.url, items, format='json').json()
+        self.assertEqual(
+            [r['status'] for r in data['results']],
+            ['created', 'updated', 'unchanged', 'not_found', 'error', 'error', 'error']
+        )
+        self.assertEqual(data['counts'], {'created': 1, 'updated': 1, 'unchanged': 1, 'not_found': 1, 'error': 3})
+        self.assertIn('vietnamese_translation_1', data['results'][4]['errors'])
+        dog = EnglishWord.objects.get(english_word="dog")
+        self.assertEqual(data['results'][0]['id'], dog.pk)
+        self.assertEqual((dog.vietnamese_translation_2, [normalized for _, _, normalized in dog.get_meanings()][1]), ("cún", "cun"))
+        self.hello.refresh_from_db()
+        self.assertEqual((self.hello.vietnamese_translation_1, [normalized for _, _, normalized in self.hello.get_meanings()]), ("chào", ["chao"]))
+
+    def test_ndjson_upsert_and_delete(self):
+        body = '{"op": "delete", "english_word": "cat"}\n\n{"english_word": "hello", "vietnamese_translation_1": "alo"}\n'
+        response = self.api.post(self.url, body, content_type='application/x-ndjson')
+        self.assertEqual([r['status'] for r in response.json()['results']], ['deleted', 'updated'])
+        self.assertFalse(EnglishWord.objects.filter(english_word="cat").exists())
+        # Caches and indexes follow the bulk write
+        check = self.client.post(reverse('word-check-translation', args=[self.hello.pk]), {'translation': 'alo'})
+        self.assertTrue(check.json()['is_correct'])
+        self.assertEqual(self.api.post(self.url, '{"english_word": ', content_type='application/x-ndjson').status_code, 400)
+
+    def test_requires_admin_and_a_list(self):
+        self.assertIn(self.client.post(self.url, [], content_type='application/json').status_code, (401, 403))
+        self.assertEqual(self.api.post(self.url, {'english_word': "dog"}, format='json').status_code, 400)
+
+    @skipUnless(os.environ.get('RUN_BENCHMARKS'), "timing benchmark; set RUN_BENCHMARKS=1 to run it")
+    def test_benchmark_bulk_upsert(self):
+        items = [{'english_word': f"word{i}", 'vietnamese_translation_1': f"nghĩa {i}"} for i in range(10000)]
+        start = timeit.default_timer()
+        data = self.api.post(self.url, items, format='json').json()
+        elapsed = timeit.default_timer() - start
+        self.assertEqual(data['counts'], {'created': 10000})
+        self.assertLess(elapsed, 30)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.url = reverse('word-export')
+        EnglishWord.objects.create(english_word="hello", vietnamese_translation_1="xin chào", vietnamese_translation_2="chào bạn")
+        EnglishWord.objects.create(english_word="say", vietnamese_translation_1='nói "to", rõ', vietnamese_translation_3="")
+
+    def download(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content)
+
+    def test_wordlist_round_trips_through_load_words(self):
+        content = self.download()
+        self.assertEqual(content.decode('utf-8'), 'hello__xin chào--chào bạn\nsay__nói "to", rõ\n')
+        handle, path = tempfile.mkstemp(suffix='.txt')
+        with os.fdopen(handle, 'wb') as f:
+            f.write(content)
+        self.addCleanup(os.remove, path)
+        out = StringIO()
+        call_command('load_words', '--file', path, '--sync', stdout=out)
+        self.assertIn("Unchanged: 2.", out.getvalue())
+
+    def test_ndjson_matches_api_and_csv(self):
+        lines = self.download(**{'as': 'ndjson'}).decode('utf-8').splitlines()
+        api_results = list(reversed(self.client.get(reverse('word-list')).json()['results']))
+        self.assertEqual([json.loads(line) for line in lines], api_results)
+        self.assertEqual(lines[0].encode('utf-8'), JSONRenderer().render(api_results[0]))
+
+        rows = list(csv.reader(io.StringIO(self.download(**{'as': 'csv'}).decode('utf-8'))))
+        self.assertEqual(rows[0], WORD_FIELDS)
+        self.assertEqual(rows[2][1:3], ["say", 'nói "to", rõ'])
+        self.assertEqual(len(rows), 3)
+
+    def test_gzip(self):
+        self.assertEqual(gzip.decompress(self.download(gzip='1')), self.download())
+        self.assertEqual(self.client.get(self.url, {'as': 'xml'}).status_code, 400)
+
+    def test_streams_in_chunks(self):
+        EnglishWord.objects.bulk_create(EnglishWord(english_word=f"w{i}", vietnamese_translation_1="x") for i in range(4500))
+        chunks = list(self.client.get(self.url).streaming_content)
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(sum(chunk.count(b'\n') for chunk in chunks), 4502)
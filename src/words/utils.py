@@ -0,0 +1,100 @@
+import hashlib
+import unicodedata
+from functools import lru_cache
+from unidecode import unidecode
+
+TRANSLATION_FIELDS = [f'vietnamese_translation_{i}' for i in range(1, 6)]
+
+# Code points used by Vietnamese letters with diacritics: Latin-1 (à, é, ô, ...),
+# Latin Extended-A/B (ă, đ, ĩ, ơ, ư, ...) and Latin Extended Additional (ạ, ế, ỳ, ...).
+_VIETNAMESE_RANGES = (range(0x00C0, 0x0250), range(0x1EA0, 0x1F00))
+NORMALIZE_CACHE_SIZE = 8192
+# Only strings up to the meaning column width are memoized; longer ones can only come from
+# request input and would let clients fill the cache with arbitrarily large keys and values.
+NORMALIZE_CACHE_MAX_LENGTH = 255
+
+
+def _build_fold_tables():
+    """
+    Build the str.translate tables: one that only strips diacritics, and one that also
+    lowercases and maps spaces to '-' (used by normalize_text_for_comparison).
+    """
+    fold = {ord('đ'): 'd', ord('Đ'): 'D'}
+    for code_point in (cp for cp_range in _VIETNAMESE_RANGES for cp in cp_range):
+        base = ''.join(c for c in unicodedata.normalize('NFD', chr(code_point)) if not unicodedata.combining(c))
+        if len(base) == 1 and base.isascii() and base.isalpha():
+            fold.setdefault(code_point, base)
+
+    comparison = {code_point: base.lower() for code_point, base in fold.items()}
+    comparison.update({code_point: chr(code_point).lower() for code_point in range(ord('A'), ord('Z') + 1)})
+    return fold, comparison
+
+
+_FOLD_TABLE, _COMPARISON_TABLE = _build_fold_tables()
+# Joins strings for normalize_many(); not whitespace, so it survives the split on spaces
+_BATCH_SEPARATOR = '\x00'
+
+
+def remove_vietnamese_diacritics(text):
+    """
+    Loại bỏ dấu tiếng Việt khỏi một chuỗi.
+    Ký tự ngoài bảng chữ cái tiếng Việt được chuyển tự bằng unidecode.
+    """
+    if text.isascii():
+        return text
+    text = unicodedata.normalize('NFC', text).translate(_FOLD_TABLE)
+    return text if text.isascii() else unidecode(text)
+
+
+def _finish_comparison(text):
+    if not text.isascii():
+        # Characters outside the Vietnamese alphabet: fall back to general transliteration
+        text = unidecode(text.lower())
+    return '-'.join(text.split())
+
+
+def _normalize_for_comparison(text):
+    if not text.isascii():
+        text = unicodedata.normalize('NFC', text)
+    return _finish_comparison(text.translate(_COMPARISON_TABLE))
+
+
+_normalize_cached = lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(_normalize_for_comparison)
+
+
+def normalize_text_for_comparison(text):
+    """
+    Chuẩn hóa văn bản để so sánh:
+    1. Chuyển thành chữ thường.
+    2. Loại bỏ dấu tiếng Việt (NFC trước, rồi tra bảng str.translate dựng sẵn).
+    3. Thay mỗi cụm khoảng trắng bằng một dấu gạch nối, bỏ khoảng trắng ở hai đầu.
+    Kết quả của các chuỗi ngắn (tối đa NORMALIZE_CACHE_MAX_LENGTH ký tự) được ghi nhớ trong một cache LRU nhỏ.
+    """
+    if len(text) <= NORMALIZE_CACHE_MAX_LENGTH:
+        return _normalize_cached(text)
+    return _normalize_for_comparison(text)
+
+
+def normalize_many(texts):
+    """
+    normalize_text_for_comparison() cho cả một danh sách chuỗi,
+    dùng một lần NFC và một lần translate cho toàn bộ danh sách.
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+    if any(_BATCH_SEPARATOR in text for text in texts):
+        return [normalize_text_for_comparison(text) for text in texts]
+    joined = _BATCH_SEPARATOR.join(texts)
+    if not joined.isascii():
+        joined = unicodedata.normalize('NFC', joined)
+    return [_finish_comparison(text) for text in joined.translate(_COMPARISON_TABLE).split(_BATCH_SEPARATOR)]
+
+def compute_content_hash(english_word, translations):
+    """
+    Fingerprint of a word's stored content: the English word plus its meanings, the first
+    five as in the vietnamese_translation_* fields (None and '' are treated the same).
+    """
+    slots = max(len(translations), len(TRANSLATION_FIELDS))
+    parts = [english_word] + [(translations[i] if i < len(translations) else None) or '' for i in range(slots)]
+    return hashlib.blake2b('\x1f'.join(parts).encode('utf-8'), digest_size=16).hexdigest()
@@ -1,41 +1,41 @@
-import random
 from django.shortcuts import render, redirect
 from django.views import View
 from django.contrib import messages
 from .models import EnglishWord
 from .forms import TranslationForm
+import random
+from .sampling import get_random_word, sample_distractors, sample_words, pick_distractors
+from .utils import normalize_text_for_comparison, normalize_many, remove_vietnamese_diacritics
+from .cache import answer_key_cache, build_answer_key, get_answer_key
+from rest_framework.permissions import IsAdminUser
+from .fuzzy import MAX_EDIT_DISTANCE, closest_match, meaning_index
+from .lookup import PHRASE, TOKEN, reverse_index, prefix_index
 from rest_framework import viewsets, status, response
-from unidecode import unidecode
 from rest_framework import viewsets
-from .serializers import EnglishWordSerializer
+from .serializers import EnglishWordSerializer, WORD_COLUMNS, WORD_FIELDS, word_dicts
+from .pagination import EnglishWordCursorPagination
 from rest_framework.decorators import action
-
-def remove_vietnamese_diacritics(text):
-    """
-    Loại bỏ dấu tiếng Việt khỏi một chuỗi.
-    """
-    return unidecode(text)
-
-def normalize_text_for_comparison(text):
-    """
-    Chuẩn hóa văn bản để so sánh:
-    1. Chuyển thành chữ thường.
-    2. Loại bỏ dấu tiếng Việt.
-    3. Thay thế khoảng trắng bằng dấu gạch nối.
-    """
-    text = text.lower()
-    text = remove_vietnamese_diacritics(text)
-    text = text.replace(" ", "-")
-    return text
+from rest_framework.exceptions import ParseError
+from rest_framework.generics import get_object_or_404
+from .catalog import get_catalog_version
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+import hashlib
+from collections import Counter
+from rest_framework.parsers import JSONParser
+from .parsers import NDJSONParser
+from .bulk import write_words
+from .export import CONTENT_TYPES, EXPORTERS, EXTENSIONS, WORDLIST, gzip_stream
+from django.http import StreamingHttpResponse
+from django.db.models import prefetch_related_objects
 
 class RandomWordQuizView(View):
     def get(self, request):
-        all_words = list(EnglishWord.objects.all())
-        if not all_words:
+        random_word = get_random_word()
+        if random_word is None:
             messages.warning(request, "There are no words in the database yet. Please add some words.")
             return render(request, 'random_word_quiz.html', {'form': TranslationForm()})
 
-        random_word = random.choice(all_words)
         request.session['current_word_id'] = random_word.id
         form = TranslationForm()
         return render(request, 'random_word_quiz.html', {'word': random_word, 'form': form})
@@ -49,7 +49,7 @@ class RandomWordQuizView(View):
             return redirect('words:random_word_quiz')
 
         try:
-            current_word = EnglishWord.objects.get(id=current_word_id)
+            answer_key = get_answer_key(current_word_id, lambda: EnglishWord.objects.get(id=current_word_id))
         except EnglishWord.DoesNotExist:
             messages.error(request, "The word does not exist. Please try again.")
             if 'current_word_id' in request.session:
@@ -60,40 +60,111 @@ class RandomWordQuizView(View):
             user_input_raw = form.cleaned_data['translation'].strip()
             user_translation_normalized = normalize_text_for_comparison(user_input_raw)
             
-            correct_translations_raw = current_word.get_all_translations()
-            correct_translations_normalized = [normalize_text_for_comparison(t.strip()) for t in correct_translations_raw if t]
+            correct_translations_raw = answer_key.translations
+            correct_translations_normalized = answer_key.normalized
 
             is_correct = user_translation_normalized in correct_translations_normalized
 
             if is_correct:
                 all_meanings_str = ", ".join(filter(None, correct_translations_raw))
-                messages.success(request, f"Exactly! '{current_word.english_word}' can mean '{user_input_raw}'. All correct meanings: {all_meanings_str}.")
+                messages.success(request, f"Exactly! '{answer_key.english_word}' can mean '{user_input_raw}'. All correct meanings: {all_meanings_str}.")
             else:
                 all_meanings_str = ", ".join(filter(None, correct_translations_raw))
-                messages.error(request, f"Incorrect. The correct meanings of '{current_word.english_word}' are: '{all_meanings_str}'. You entered: '{user_input_raw}'.")
+                messages.error(request, f"Incorrect. The correct meanings of '{answer_key.english_word}' are: '{all_meanings_str}'. You entered: '{user_input_raw}'.")
             
             if 'current_word_id' in request.session:
                 del request.session['current_word_id'] 
             return redirect('words:random_word_quiz') 
         
+        current_word = EnglishWord.objects.filter(id=current_word_id).first()
         return render(request, 'random_word_quiz.html', {'word': current_word, 'form': form})
 
+QUIZ_ROUND_DEFAULT_SIZE = 10
+QUIZ_ROUND_MAX_SIZE = 50
+QUIZ_ROUND_CHOICES = 2 # Wrong answers per easy question
+QUIZ_ROUND_POOL_FACTOR = 3 # Words fetched per question to draw distractors from
+CHECK_ROUND_MAX_SIZE = 100
+DID_YOU_MEAN_MAX_LIMIT = 20
+REVERSE_LOOKUP_MAX_LIMIT = 50
+AUTOCOMPLETE_MAX_LIMIT = 50
+BULK_WRITE_MAX_ITEMS = 100000
+BULK_WRITE_BATCH_SIZE = 1000
+
 class EnglishWordViewSet(viewsets.ModelViewSet):
     """
     API endpoint that allows words to be viewed or edited.
     """
     queryset = EnglishWord.objects.all().order_by('-id')
     serializer_class = EnglishWordSerializer
+    pagination_class = EnglishWordCursorPagination
+
+    def get_requested_fields(self):
+        """
+        Fields named in '?fields=id,english_word' on list/retrieve, or None for all fields.
+        """
+        if self.action not in ('list', 'retrieve') or 'fields' not in self.request.query_params:
+            return None
+        fields = [name.strip() for name in self.request.query_params['fields'].split(',') if name.strip()]
+        unknown = [name for name in fields if name not in WORD_FIELDS]
+        if not fields or unknown:
+            raise ParseError(f"'fields' must be a comma-separated subset of: {', '.join(WORD_FIELDS)}.")
+        # Same order as the full serializer output, whatever order they were asked in
+        return [name for name in WORD_FIELDS if name in fields]
+
+    def get_validators(self, request):
+        """
+        Strong ETag and Last-Modified timestamp for a list/detail response. The ETag covers the
+        catalog version and everything else that changes the body: path, query string
+        (cursor, page size, fields) and the negotiated media type.
+        """
+        version, updated_at = get_catalog_version()
+        key = f"{version}:{request.path}:{request.META.get('QUERY_STRING', '')}:{request.accepted_media_type}"
+        # Whole seconds, like the If-Modified-Since header it is compared with
+        return quote_etag(hashlib.blake2b(key.encode(), digest_size=16).hexdigest()), int(updated_at.timestamp())
+
+    def conditional_read(self, request, read):
+        """
+        Answer If-None-Match/If-Modified-Since with 304 before any row is read, otherwise
+        return read() with ETag and Last-Modified set.
+        """
+        etag, last_modified = self.get_validators(request)
+        result = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if result is None:
+            result = read()
+        if result.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            result['ETag'] = etag
+            result['Last-Modified'] = http_date(last_modified)
+        return result
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_read(request, self.read_list)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_read(request, lambda: self.read_detail(kwargs['pk']))
+
+    def read_list(self):
+        """
+        Read path without the ModelSerializer: rows come straight from values() and
+        word_dicts() turns them into the same dicts EnglishWordSerializer would produce.
+        """
+        fields = self.get_requested_fields() or WORD_FIELDS
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset.values(*WORD_COLUMNS))
+        return self.get_paginated_response(word_dicts(page, fields))
+
+    def read_detail(self, pk):
+        fields = self.get_requested_fields() or WORD_FIELDS
+        row = get_object_or_404(self.get_queryset().values(*WORD_COLUMNS), pk=pk)
+        return response.Response(word_dicts([row], fields)[0])
 
     @action(detail=False, methods=['get'], url_path='medium-quiz-choices')
     def medium_quiz_choices(self, request):
         """
         Get a random English word.
         """
-        words = self.get_queryset()
-        if not words.exists():
+        random_word = get_random_word(self.get_queryset())
+        if random_word is None:
             return response.Response({"detail": "No words available."}, status=status.HTTP_404_NOT_FOUND)
-        random_word = random.choice(list(words)) # Convert queryset to list for random.choice
         serializer = self.get_serializer(random_word)
         return response.Response(serializer.data)
 
@@ -102,21 +173,37 @@ class EnglishWordViewSet(viewsets.ModelViewSet):
         """
         Check the user's translation for a specific word.
         Expects {'translation': 'user_input'} in the request body.
+        Optional 'max_distance' (0 to WORDS_FUZZY_MATCH['MAX_DISTANCE']) turns on typo-tolerant
+        grading: an answer within that many edits of a meaning is accepted, and the response
+        also reports the matched meaning and the edit distance.
         """
-        word = self.get_object() # Get the specific word instance based on pk
+        try:
+            max_distance = int(request.data.get('max_distance', 0))
+        except (TypeError, ValueError):
+            return response.Response({"detail": "'max_distance' must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0 <= max_distance <= MAX_EDIT_DISTANCE:
+            return response.Response(
+                {"detail": f"'max_distance' must be between 0 and {MAX_EDIT_DISTANCE}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        answer_key = get_answer_key(pk, self.get_object) # Only hits the database on a cache miss
 
         user_input_raw = request.data.get('translation', '').strip()
 
         user_translation_normalized = normalize_text_for_comparison(user_input_raw)
-        
-        correct_translations_raw = word.get_all_translations()
-        correct_translations_normalized = [normalize_text_for_comparison(t.strip()) for t in correct_translations_raw if t]
 
-        is_correct = user_translation_normalized in correct_translations_normalized
-        
-        valid_raw_translations = [t for t in correct_translations_raw if t]
+        if not max_distance:
+            is_correct = user_translation_normalized in answer_key.normalized
+            return response.Response({"is_correct": is_correct, "correct_translations": list(answer_key.translations)})
 
-        return response.Response({"is_correct": is_correct, "correct_translations": valid_raw_translations})
+        match_index, distance = closest_match(user_translation_normalized, answer_key.normalized, max_distance)
+        return response.Response({
+            "is_correct": match_index is not None,
+            "correct_translations": list(answer_key.translations),
+            "matched_translation": answer_key.translations[match_index] if match_index is not None else None,
+            "distance": distance
+        })
 
     @action(detail=False, methods=['get'], url_path='easy-quiz-choices') # Changed detail to False, removed pk
     def easy_quiz_choices(self, request):
@@ -128,11 +215,10 @@ class EnglishWordViewSet(viewsets.ModelViewSet):
         2. vietnamese_translation_1 of a different random word.
         3. vietnamese_translation_1 of another different random word.
         """
-        all_words = list(EnglishWord.objects.all())
-        if not all_words:
+        current_word = get_random_word(self.get_queryset())
+        if current_word is None:
             return response.Response({"detail": "No words available in the database."}, status=status.HTTP_404_NOT_FOUND)
 
-        current_word = random.choice(all_words)
         if not current_word.vietnamese_translation_1:
              # Or handle this case differently, e.g., pick another word
             return response.Response(
@@ -142,23 +228,18 @@ class EnglishWordViewSet(viewsets.ModelViewSet):
 
         current_word_translation = current_word.vietnamese_translation_1
 
-        other_words = list(EnglishWord.objects.exclude(pk=current_word.pk))
+        other_random_translations = sample_distractors(current_word, k=2, queryset=self.get_queryset())
 
-        if len(other_words) < 2:
+        if len(other_random_translations) < 2:
             return response.Response(
                 {"detail": "Not enough other words available to generate two distinct choices."},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        random_choices = random.sample(other_words, 2)
-        
         return response.Response({
             "english_word": current_word.english_word,
             "correct_translation": current_word_translation, # Renamed for clarity
-            "other_random_translations": [
-                random_choices[0].vietnamese_translation_1,
-                random_choices[1].vietnamese_translation_1
-            ]
+            "other_random_translations": other_random_translations
         }, status=status.HTTP_200_OK)
     
     @action(detail=False, methods=['post'], url_path='check-easy-translation')
@@ -177,27 +258,322 @@ class EnglishWordViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        try:
-            word_obj = EnglishWord.objects.get(english_word__iexact=english_word_str)
-        except EnglishWord.DoesNotExist:
+        word_id = EnglishWord.objects.filter(english_word__iexact=english_word_str).values_list('pk', flat=True).first()
+        if word_id is None:
             return response.Response(
                 {"detail": f"Word '{english_word_str}' not found."},
                 status=status.HTTP_404_NOT_FOUND
             )
+        answer_key = get_answer_key(word_id, lambda: EnglishWord.objects.get(pk=word_id))
 
-        correct_primary_translation = word_obj.vietnamese_translation_1
-        if not correct_primary_translation:
+        if not answer_key.translations:
             return response.Response(
                 {"detail": f"Word '{english_word_str}' does not have a primary Vietnamese translation defined."},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        correct_primary_translation = answer_key.translations[0]
 
         normalized_selected = normalize_text_for_comparison(selected_translation_str.strip())
-        normalized_correct = normalize_text_for_comparison(correct_primary_translation.strip())
+        normalized_correct = answer_key.normalized[0]
 
         is_correct = (normalized_selected == normalized_correct)
 
         return response.Response({
             "is_correct": is_correct,
             "correct_translation": correct_primary_translation # Trả về bản dịch đúng (chưa chuẩn hóa)
-        }, status=status.HTTP_200_OK)
\ No newline at end of file
+        }, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path='quiz-round')
+    def quiz_round(self, request):
+        """
+        Returns a whole round of distinct quiz questions in one request.
+        Query params: 'mode' ('easy', 'medium' or 'reverse', default 'easy'), 'count' (default 10, max 50)
+        and an optional integer 'seed' to make the round reproducible.
+        Easy questions have the same shape as easy-quiz-choices (plus 'id'),
+        medium questions the same shape as medium-quiz-choices. Reverse questions give a
+        Vietnamese meaning to be answered with check-reverse-translation.
+        """
+        mode = request.query_params.get('mode', 'easy')
+        if mode not in ('easy', 'medium', 'reverse'):
+            return response.Response({"detail": "'mode' must be 'easy', 'medium' or 'reverse'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            count = int(request.query_params.get('count', QUIZ_ROUND_DEFAULT_SIZE))
+            seed = request.query_params.get('seed')
+            seed = int(seed) if seed is not None else None
+        except ValueError:
+            return response.Response({"detail": "'count' and 'seed' must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= count <= QUIZ_ROUND_MAX_SIZE:
+            return response.Response(
+                {"detail": f"'count' must be between 1 and {QUIZ_ROUND_MAX_SIZE}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        rng = random.Random(seed)
+
+        if mode == 'medium':
+            words = sample_words(count, queryset=self.get_queryset(), rng=rng)
+            if not words:
+                return response.Response({"detail": "No words available."}, status=status.HTTP_404_NOT_FOUND)
+            # The serializer lists every meaning; load them for the whole round in one query
+            prefetch_related_objects(words, 'translations')
+            questions = self.get_serializer(words, many=True).data
+            return response.Response({"mode": mode, "seed": seed, "questions": questions}, status=status.HTTP_200_OK)
+
+        if mode == 'reverse':
+            words = sample_words(count, queryset=self.get_queryset(), rng=rng)
+            if not words:
+                return response.Response({"detail": "No words available."}, status=status.HTTP_404_NOT_FOUND)
+            questions = [{"id": word.id, "vietnamese_translation": word.vietnamese_translation_1} for word in words]
+            return response.Response({"mode": mode, "seed": seed, "questions": questions}, status=status.HTTP_200_OK)
+
+        pool = sample_words(count * QUIZ_ROUND_POOL_FACTOR, queryset=self.get_queryset(), rng=rng)
+        if not pool:
+            return response.Response({"detail": "No words available in the database."}, status=status.HTTP_404_NOT_FOUND)
+
+        questions = []
+        for word in pool[:count]:
+            if not word.vietnamese_translation_1:
+                continue
+            distractors = pick_distractors(word, pool, k=QUIZ_ROUND_CHOICES, rng=rng)
+            if len(distractors) < QUIZ_ROUND_CHOICES:
+                continue
+            questions.append({
+                "id": word.id,
+                "english_word": word.english_word,
+                "correct_translation": word.vietnamese_translation_1,
+                "other_random_translations": distractors
+            })
+
+        if not questions:
+            return response.Response(
+                {"detail": "Not enough other words available to generate two distinct choices."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return response.Response({"mode": mode, "seed": seed, "questions": questions}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'], url_path='check-round')
+    def check_round(self, request):
+        """
+        Grades a whole quiz round in one request.
+        Expects {'mode': 'easy' | 'medium', 'answers': [{'id': word_id, 'translation': 'user_input'}, ...]}.
+        'medium' (default) accepts any meaning of the word like check_translation,
+        'easy' only the primary meaning like check_easy_translation.
+        """
+        mode = request.data.get('mode', 'medium')
+        answers = request.data.get('answers')
+        if mode not in ('easy', 'medium'):
+            return response.Response({"detail": "'mode' must be 'easy' or 'medium'."}, status=status.HTTP_400_BAD_REQUEST)
+        if not isinstance(answers, list) or not answers:
+            return response.Response({"detail": "'answers' must be a non-empty list."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(answers) > CHECK_ROUND_MAX_SIZE:
+            return response.Response(
+                {"detail": f"At most {CHECK_ROUND_MAX_SIZE} answers can be checked at once."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            pairs = [(int(item['id']), str(item.get('translation', '')).strip()) for item in answers]
+        except (TypeError, KeyError, ValueError):
+            return response.Response(
+                {"detail": "Each answer must be an object with an integer 'id' and a 'translation'."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        answer_keys = {}
+        for word_id, _ in pairs:
+            answer_key = answer_key_cache.get(word_id)
+            if answer_key is not None:
+                answer_keys[word_id] = answer_key
+        missing_ids = {word_id for word_id, _ in pairs} - answer_keys.keys()
+        if missing_ids:
+            for word_id, word in EnglishWord.objects.with_translations().in_bulk(missing_ids).items():
+                answer_keys[word_id] = build_answer_key(word)
+                answer_key_cache.set(word_id, answer_keys[word_id])
+        normalized_answers = normalize_many(answer for _, answer in pairs)
+
+        results = []
+        score = 0
+        for (word_id, answer), normalized_answer in zip(pairs, normalized_answers):
+            answer_key = answer_keys.get(word_id)
+            if answer_key is None:
+                results.append({"id": word_id, "is_correct": False, "detail": "Word not found."})
+                continue
+
+            correct_translations_raw = list(answer_key.translations)
+            correct_translations_normalized = answer_key.normalized
+            if mode == 'easy':
+                correct_translations_raw = correct_translations_raw[:1]
+                correct_translations_normalized = correct_translations_normalized[:1]
+
+            is_correct = normalized_answer in correct_translations_normalized
+            score += is_correct
+            results.append({"id": word_id, "is_correct": is_correct, "correct_translations": correct_translations_raw})
+
+        return response.Response({"results": results, "score": score, "total": len(pairs)}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path='answer-key-cache-stats', permission_classes=[IsAdminUser])
+    def answer_key_cache_stats(self, request):
+        """
+        Returns hit/miss counters and the current size of the process-local answer-key cache.
+        """
+        return response.Response(answer_key_cache.stats(), status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path='did-you-mean')
+    def did_you_mean(self, request):
+        """
+        Suggests Vietnamese meanings close to a (possibly misspelled) input, across the whole vocabulary.
+        Query params: 'q' (required), 'max_distance' (default and max WORDS_FUZZY_MATCH['MAX_DISTANCE']),
+        'limit' (default 5, max 20).
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return response.Response({"detail": "Missing 'q'."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            max_distance = int(request.query_params.get('max_distance', MAX_EDIT_DISTANCE))
+            limit = int(request.query_params.get('limit', 5))
+        except ValueError:
+            return response.Response({"detail": "'max_distance' and 'limit' must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0 <= max_distance <= MAX_EDIT_DISTANCE or not 1 <= limit <= DID_YOU_MEAN_MAX_LIMIT:
+            return response.Response(
+                {"detail": f"'max_distance' must be between 0 and {MAX_EDIT_DISTANCE}, 'limit' between 1 and {DID_YOU_MEAN_MAX_LIMIT}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        suggestions = []
+        for distance, _, words in meaning_index.suggest(normalize_text_for_comparison(query), max_distance, limit):
+            suggestions.append({
+                "translation": next(iter(words.values()))[1],
+                "distance": distance,
+                "words": [{"id": word_id, "english_word": english_word} for word_id, (english_word, _) in sorted(words.items())]
+            })
+        return response.Response({"query": query, "suggestions": suggestions}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path='reverse-lookup')
+    def reverse_lookup(self, request):
+        """
+        Finds the English words that mean a given Vietnamese phrase, from an in-memory inverted index.
+        Query params: 'q' (required), 'match' ('phrase' for the whole meaning, default,
+        or 'token' for meanings containing every word of 'q') and 'limit' (default 20, max 50).
+        """
+        query = request.query_params.get('q', '').strip()
+        match = request.query_params.get('match', PHRASE)
+        if not query:
+            return response.Response({"detail": "Missing 'q'."}, status=status.HTTP_400_BAD_REQUEST)
+        if match not in (PHRASE, TOKEN):
+            return response.Response({"detail": "'match' must be 'phrase' or 'token'."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = int(request.query_params.get('limit', 20))
+        except ValueError:
+            return response.Response({"detail": "'limit' must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= limit <= REVERSE_LOOKUP_MAX_LIMIT:
+            return response.Response(
+                {"detail": f"'limit' must be between 1 and {REVERSE_LOOKUP_MAX_LIMIT}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        results = [
+            {"id": word_id, "english_word": english_word, "translations": translations, "matched_translations": matched}
+            for word_id, english_word, translations, matched in reverse_index.lookup(normalize_text_for_comparison(query), match, limit)
+        ]
+        return response.Response({"query": query, "match": match, "results": results}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'], url_path='check-reverse-translation')
+    def check_reverse_translation(self, request):
+        """
+        Grades a reverse (Vietnamese -> English) quiz answer.
+        Expects {'translation': 'vietnamese prompt', 'english_word': 'user_input'} in the request body.
+        Any English word that has the prompt as one of its meanings is accepted.
+        """
+        translation_str = request.data.get('translation', '').strip()
+        english_word_str = request.data.get('english_word', '').strip()
+        if not translation_str or not english_word_str:
+            return response.Response(
+                {"detail": "Missing 'translation' or 'english_word'."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Graded against the database (indexed Translation.normalized), not the per-process index
+        words_with_meaning = EnglishWord.objects.with_meaning(translation_str)
+        correct_words = list(words_with_meaning.order_by('english_word').values_list('english_word', flat=True)[:REVERSE_LOOKUP_MAX_LIMIT])
+        if not correct_words:
+            return response.Response(
+                {"detail": f"No word has the meaning '{translation_str}'."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        is_correct = words_with_meaning.filter(english_word__iexact=english_word_str).exists()
+        return response.Response({"is_correct": is_correct, "correct_english_words": correct_words}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path='autocomplete')
+    def autocomplete(self, request):
+        """
+        Returns English words starting with a prefix (case-insensitive), in alphabetical order.
+        Query params: 'q' (required) and 'limit' (default 10, max 50).
+        """
+        prefix = request.query_params.get('q', '').strip()
+        if not prefix:
+            return response.Response({"detail": "Missing 'q'."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = int(request.query_params.get('limit', 10))
+        except ValueError:
+            return response.Response({"detail": "'limit' must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= limit <= AUTOCOMPLETE_MAX_LIMIT:
+            return response.Response(
+                {"detail": f"'limit' must be between 1 and {AUTOCOMPLETE_MAX_LIMIT}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        results = [
+            {"id": word_id, "english_word": english_word}
+            for english_word, word_id in prefix_index.autocomplete(prefix, limit)
+        ]
+        return response.Response({"query": prefix, "results": results}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'], url_path='bulk', permission_classes=[IsAdminUser], parser_classes=[JSONParser, NDJSONParser])
+    def bulk(self, request):
+        """
+        Creates, updates and deletes many words in one transaction, keyed by english_word.
+        Body: a JSON array (application/json) or one object per line (application/x-ndjson) of
+        {'op': 'upsert' (default) or 'delete', 'english_word': ..., 'vietnamese_translation_1'..'_5': ...}.
+        An upsert replaces all meanings of an existing word. Returns one status per item, in order:
+        created, updated, unchanged, deleted, not_found or error.
+        """
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return response.Response({"detail": "Expected a non-empty list of items."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > BULK_WRITE_MAX_ITEMS:
+            return response.Response(
+                {"detail": f"At most {BULK_WRITE_MAX_ITEMS} items can be written at once."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        results = write_words(items, BULK_WRITE_BATCH_SIZE)
+        return response.Response(
+            {"results": results, "counts": Counter(result['status'] for result in results)},
+            status=status.HTTP_200_OK
+        )
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """
+        Streams the whole vocabulary as a file download, in id order.
+        Query params: 'as' ('wordlist' (default): 'english__vi1--vi2' lines as read by load_words,
+        'ndjson' or 'csv': the API fields) and 'gzip' ('1' to compress the stream).
+        """
+        export_format = request.query_params.get('as', WORDLIST)
+        if export_format not in EXPORTERS:
+            return response.Response(
+                {"detail": f"'as' must be one of: {', '.join(EXPORTERS)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        compress = request.query_params.get('gzip') in ('1', 'true')
+
+        chunks = EXPORTERS[export_format]()
+        filename = f"words.{EXTENSIONS[export_format]}"
+        if compress:
+            chunks = gzip_stream(chunks)
+            filename += '.gz'
+        streaming_response = StreamingHttpResponse(
+            chunks, content_type='application/gzip' if compress else CONTENT_TYPES[export_format]
+        )
+        streaming_response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return streaming_response
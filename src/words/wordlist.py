@@ -0,0 +1,135 @@
+"""
+Helpers for reading wordlist files in the `english__vi1--vi2--...` format.
+
+This module must not import Django models: parse_range() runs in worker processes
+that do not set up Django.
+"""
+import mmap
+import os
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from .utils import normalize_many, compute_content_hash
+
+MALFORMED = 'malformed'
+EMPTY = 'empty'
+
+# Size of the byte ranges handed to each parser process.
+DEFAULT_CHUNK_BYTES = 4 * 1024 * 1024
+
+# One line of a wordlist. For importable lines english_word, translations, normalized
+# (normalized forms of the meanings) and content_hash are set; for skipped ones, line and reason.
+ParsedLine = namedtuple(
+    'ParsedLine', ['line_number', 'line', 'english_word', 'translations', 'normalized', 'content_hash', 'reason']
+)
+
+
+def parse_line(line):
+    """
+    Parse one wordlist line into (english_word, [translations]).
+    Returns (None, reason) for lines that cannot be imported, with reason MALFORMED
+    (blank or no '__' separator) or EMPTY (no English word or no translations).
+    """
+    line = line.strip()
+    if not line or '__' not in line:
+        return None, MALFORMED
+
+    english_part, vietnamese_part = line.split('__', 1)
+    english_word = english_part.strip()
+    # Split Vietnamese meanings by '--'
+    translations = [trans.strip() for trans in vietnamese_part.split('--') if trans.strip()]
+
+    if not english_word or not translations:
+        return None, EMPTY
+    return english_word, translations
+
+
+def format_line(english_word, translations):
+    """
+    Inverse of parse_line(): one wordlist line (without the newline), skipping empty meanings.
+    """
+    return f"{english_word}__{'--'.join(t.strip() for t in translations if t and t.strip())}"
+
+
+def parse_lines(lines, first_line_number=1):
+    """
+    Parse an iterable of lines into ParsedLine tuples, normalizing the stored meanings.
+    """
+    for line_number, line in enumerate(lines, first_line_number):
+        english_word, result = parse_line(line)
+        if english_word is None:
+            yield ParsedLine(line_number, line.strip(), None, None, None, None, result)
+        else:
+            yield ParsedLine(line_number, None, english_word, result, normalize_many(result), compute_content_hash(english_word, result), None)
+
+
+def skipped_line_message(line_number, line, reason):
+    line = line.strip()
+    if reason == MALFORMED:
+        return f'Skipping malformed line {line_number}: "{line}"'
+    return f'Skipping line {line_number} due to empty English word or translations: "{line}"'
+
+
+def line_aligned_ranges(path, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """
+    Yield (start, end) byte offsets covering the file, each range ending right after a newline
+    (or at the end of the file), so no line is split between two ranges.
+    """
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        start = 0
+        while start < size:
+            end = min(start + chunk_bytes, size)
+            if end < size:
+                newline = mm.find(b'\n', end - 1)
+                end = size if newline == -1 else newline + 1
+            yield start, end
+            start = end
+
+
+def parse_range(path, start, end):
+    """
+    Parse the lines in bytes [start, end) of the file. Runs in a worker process.
+    Returns (line_count, [ParsedLine]) with line numbers relative to the start of the range.
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        text = mm[start:end].decode('utf-8')
+    lines = text.split('\n')
+    if text.endswith('\n'):
+        lines.pop()
+    return len(lines), list(parse_lines(lines))
+
+
+def iter_parsed_lines(path, workers=1, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """
+    Yield a ParsedLine for every line of the file, in file order.
+
+    With workers > 1 the file is split into line-aligned byte ranges that a process pool
+    parses and normalizes; at most 2 * workers ranges are in flight at once, so memory use
+    does not grow with the file size.
+    """
+    if workers <= 1:
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from parse_lines(f)
+        return
+
+    ranges = line_aligned_ranges(path, chunk_bytes)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+
+        def submit_next():
+            next_range = next(ranges, None)
+            if next_range is not None:
+                pending.append(executor.submit(parse_range, path, *next_range))
+
+        for _ in range(2 * workers):
+            submit_next()
+
+        line_offset = 0
+        while pending:
+            line_count, parsed_lines = pending.popleft().result()
+            submit_next()
+            for parsed in parsed_lines:
+                yield parsed._replace(line_number=line_offset + parsed.line_number)
+            line_offset += line_count